@@ -1,11 +1,44 @@
+import copy
 import datetime
+import itertools
 import os
-from typing import List, Dict
-from config import CURRENT_DIR
-from data import Cliente, HabitacionTipo, MejorCliente, Reservacion, ReservacionEstado
-import csv
-
-from ordenamiento import Ordenable, heapsort, mergesort, quicksort, shellsort
+from typing import Dict, Iterator, List
+from archivo import (
+    FORMATO_FECHA,
+    ArchivoReservaciones,
+    escritor_filas,
+    fila_a_reservacion,
+    fila_de_cambio,
+    filas_vigentes,
+    leer_filas,
+    reservacion_a_fila,
+)
+from asignacion import AsignadorHabitaciones
+from busqueda import IndiceTexto
+from cache import CacheEstado
+from catalogo import CatalogoHabitaciones
+from cambios import Cambio, FeedCambios, TipoCambio
+from compresion import CODECS, abrir, buscar, con_codec, variantes
+from config import CURRENT_DIR, DATA_DIR, DIAS_RESIDENTES, leer_config
+from data import Cliente, MejorCliente, Reservacion, ReservacionEstado
+from ids import ContadorIds, crear_generador_ids
+import metricas
+from indices import IndiceClientes, IndiceReservaciones, ResumenCliente
+from memo import MemoReportes, memoizar
+
+from precios import MotorPrecios
+import exportar
+import filtros
+from ordenamiento import (
+    PRESUPUESTO,
+    Ordenable,
+    heapsort,
+    mergesort,
+    ordenar,
+    ordenar_externo,
+    shellsort,
+    validar_presupuesto,
+)
 from term import *
 
 
@@ -25,6 +58,22 @@ PARAMETROS_ORDEN = dict(
     )
 )
 
+# Claves del estado que se guarda en el caché (ver :meth:`App._guardar_cache`)
+CLAVES_ESTADO = ("clientes", "reservaciones", "pendientes", "max_id")
+
+
+def _error_ocupada(
+    habitacion: str, fecha_entrada: datetime.datetime, fecha_salida: datetime.datetime
+) -> ValueError:
+    return ValueError(
+        "La habitación %s está ocupada entre el %s y el %s"
+        % (
+            habitacion,
+            fecha_entrada.strftime("%d/%m/%Y"),
+            fecha_salida.strftime("%d/%m/%Y"),
+        )
+    )
+
 
 class App:
     """
@@ -38,18 +87,130 @@ class App:
         hotel: str,
         habitaciones: Dict[str, str] = {},
         precios: Dict[str, float] = {},
-        clientes: Dict[str, Cliente] = {},
-        reservaciones: List[Reservacion] = [],
+        clientes: Dict[str, Cliente] = None,
+        reservaciones: List[Reservacion] = None,
+        generador_ids=None,
+        tarifas: dict = None,
+        directorio: str = DATA_DIR,
+        compresion: str = None,
+        presupuesto_ordenamiento: int = PRESUPUESTO,
+        ruta_config: str = None,
     ):
         self.hotel = hotel
+        # Directorio de los archivos de datos del hotel
+        self.directorio = directorio
+        # Formato de compresión con el que se escriben los archivos de datos ('gzip', 'lzma', 'bz2' o `None`)
+        if compresion is not None and compresion not in CODECS:
+            raise ValueError("Formato de compresión desconocido: %s" % compresion)
+        self.compresion = compresion
+        # Cantidad máxima de elementos que los reportes ordenan en memoria. Los reportes más grandes usan el disco
+        validar_presupuesto(presupuesto_ordenamiento)
+        self.presupuesto_ordenamiento = presupuesto_ordenamiento
         self.habitaciones = habitaciones
+        self.catalogo = CatalogoHabitaciones(habitaciones)
         self.precios = precios
-        self.clientes = clientes
-        self.reservaciones = reservaciones
+        self.motor_precios = MotorPrecios(precios, tarifas)
+        # Archivo del que se leyó la configuración. Si cambia, se vuelve a leer (ver `recargar_config`)
+        self.ruta_config = ruta_config
+        self._mtime_config = self._mtime(ruta_config)
+        # Cada instancia tiene sus propios contenedores; un valor predeterminado mutable se compartiría entre ellas
+        self.clientes = clientes if clientes is not None else {}
+        self.reservaciones = reservaciones if reservaciones is not None else []
         self.ordenamiento = [1]
+        # Filtro de la lista de reservaciones (ver :mod:`filtros`)
+        self.filtro = []
+
+        # Solo las reservaciones que terminan a partir de esta fecha se mantienen en memoria
+        self.corte = datetime.datetime.combine(
+            datetime.date.today() - datetime.timedelta(days=DIAS_RESIDENTES),
+            datetime.time(),
+        )
+        self.archivo = ArchivoReservaciones(
+            self._ruta_datos("historico"), compresion
+        )
+        self.por_cliente = IndiceClientes()
+        self.por_id: Dict[int, Reservacion] = {}
+        self.por_campos = IndiceReservaciones()
+        self.asignador = AsignadorHabitaciones(habitaciones)
+        self.busqueda_clientes = IndiceTexto()
+        self.busqueda_reservaciones = IndiceTexto()
+        # Año de la partición de cada reservación del histórico agregada a la búsqueda. `None` hasta la primera búsqueda
+        self._anios_busqueda: Dict[int, int] = None
+        # Aumenta con cada cambio en los datos. Los resultados memoizados de versiones anteriores no se reutilizan
+        self.version = 0
+        self.memo = MemoReportes()
+        self.cambios = FeedCambios(self._ruta_datos("cambios"))
+        self.generador_ids = generador_ids or ContadorIds(self._ruta_datos("ids"))
+        self.cache = CacheEstado(self._ruta_datos(os.path.join(".cache", "estado.pickle")))
+
+    @classmethod
+    def desde_config(
+        cls, configs: dict, directorio: str = DATA_DIR, ruta_config: str = None
+    ) -> "App":
+        """Crea la aplicación a partir de la configuración.
+
+        :param ruta_config: archivo del que se leyó la configuración, para recargarla cuando cambie
+        """
+        return cls(
+            configs["hotel"]["nombre"],
+            configs["habitaciones"],
+            configs["precios"],
+            generador_ids=crear_generador_ids(configs.get("ids", {}), directorio),
+            tarifas=configs.get("tarifas"),
+            directorio=directorio,
+            compresion=configs.get("compresion"),
+            presupuesto_ordenamiento=configs.get(
+                "presupuesto_ordenamiento", PRESUPUESTO
+            ),
+            ruta_config=ruta_config,
+        )
+
+    @staticmethod
+    def _mtime(ruta: str):
+        """Devuelve la fecha de modificación del archivo o `None` si no existe"""
+        if ruta is None:
+            return None
+
+        try:
+            return os.stat(ruta).st_mtime_ns
+        except OSError:
+            return None
+
+    def recargar_config(self) -> bool:
+        """Vuelve a leer las habitaciones y los precios si el archivo de configuración cambió.
+
+        El catálogo de habitaciones, el motor de precios y el asignador de habitaciones se reconstruyen con la nueva
+        configuración y se descartan los reportes memoizados con la anterior. Las reservaciones existentes no cambian.
+
+        :return: si se recargó la configuración
+        :raises ValueError: si la nueva configuración no es válida. Se mantiene la anterior.
+        """
+        mtime = self._mtime(self.ruta_config)
+        if mtime is None or mtime == self._mtime_config:
+            return False
+
+        configs = leer_config(self.ruta_config)
+        try:
+            habitaciones = configs["habitaciones"]
+            precios = configs["precios"]
+        except KeyError as e:
+            raise ValueError("Falta la sección %s en la configuración" % e)
+        catalogo = CatalogoHabitaciones(habitaciones)
+        motor_precios = MotorPrecios(precios, configs.get("tarifas"))
+
+        self._mtime_config = mtime
+        self.habitaciones = habitaciones
+        self.catalogo = catalogo
+        self.precios = precios
+        self.motor_precios = motor_precios
+        self.asignador.configurar(habitaciones)
+        self.memo.limpiar()
+
+        return True
 
     ## Métodos de I.O.
 
+    @metricas.medir("app.cargar")
     def cargar(self):
         """Carga los datos del sistema.
 
@@ -58,120 +219,196 @@ class App:
 
         print_info("Cargando archivos de datos")
 
-        clientes_file_path = os.path.join(CURRENT_DIR, "data", "clientes.csv")
-        if not os.path.exists(clientes_file_path):
-            clientes_file_path = os.path.join(CURRENT_DIR, "seeds", "clientes.csv")
-
-        with open(clientes_file_path) as fp:
-            for row in csv.reader(
-                fp.readlines(),
-                delimiter=";",
-                lineterminator="\n",
-                quoting=csv.QUOTE_MINIMAL,
-            ):
+        fuentes = self._fuentes()
+        clientes_file_path, reservaciones_file_path = fuentes
+
+        estado = self.cache.leer(fuentes, CLAVES_ESTADO)
+        if estado is not None:
+            self._restaurar(estado)
+            print_info("Datos cargados")
+            return
+
+        with abrir(clientes_file_path) as fp:
+            for row in leer_filas(fp):
                 id, nombre, email = row
                 self.clientes[id] = Cliente(id, nombre, email)
+                self.busqueda_clientes.agregar(id, nombre, email)
 
-        reservaciones_file_path = os.path.join(CURRENT_DIR, "data", "reservaciones.csv")
-        if not os.path.exists(reservaciones_file_path):
-            reservaciones_file_path = os.path.join(
-                CURRENT_DIR, "seeds", "reservaciones.csv"
-            )
+        # Las fechas están en formato ISO, por lo que se pueden comparar como texto sin construir la reservación
+        corte = self.corte.strftime(FORMATO_FECHA)
+        with abrir(reservaciones_file_path) as fp:
+            filas, renumeradas = filas_vigentes(leer_filas(fp), self.generador_ids)
+            metricas.contar("app.cargar.filas", len(filas))
 
-        with open(reservaciones_file_path) as fp:
-            for row in csv.reader(
-                fp.readlines(),
-                delimiter=";",
-                lineterminator="\n",
-                quoting=csv.QUOTE_MINIMAL,
-            ):
-                (
-                    id,
-                    cliente_ci,
-                    habitacion,
-                    estado,
-                    fecha_entrada,
-                    fecha_salida,
-                    hora_entrada,
-                    hora_salida,
-                    precio,
-                    personas_count,
-                    observaciones,
-                ) = row
-                fecha_entrada = datetime.datetime.strptime(fecha_entrada, "%Y-%m-%d")
-                fecha_salida = datetime.datetime.strptime(fecha_salida, "%Y-%m-%d")
-                hora_entrada = datetime.datetime.strptime(hora_entrada, "%H:%M").time()
-                hora_salida = datetime.datetime.strptime(hora_salida, "%H:%M").time()
-                precio = float(precio)
-
-                self.reservaciones.append(
-                    Reservacion(
-                        self.clientes[cliente_ci],
-                        habitacion,
-                        ReservacionEstado(estado),
-                        fecha_entrada,
-                        fecha_salida,
-                        precio,
-                        hora_entrada,
-                        hora_salida,
-                        personas_count,
-                        observaciones,
-                        id=id,
-                    )
-                )
+            for row in filas.values():
+                if row[5] < corte:
+                    self._indexar(self.archivo.archivar(row, self.clientes))
+                else:
+                    self.agregar_reservacion(fila_a_reservacion(row, self.clientes))
+
+        if renumeradas > 0:
+            # Se reescribe el archivo para que los IDs nuevos se mantengan en las próximas cargas
+            print_info(
+                "Se asignaron IDs nuevos a %d reservación(es) con IDs repetidos"
+                % renumeradas
+            )
+            self.persistir()
+        else:
+            self._guardar_cache(fuentes)
 
         print_info("Datos cargados")
 
+    @metricas.medir("app.persistir")
     def persistir(self):
         """Persiste el estado actual del sistema"""
 
         print_info("Guardando datos")
 
-        clientes_file_path = os.path.join(CURRENT_DIR, "data", "clientes.csv")
-        reservaciones_file_path = os.path.join(CURRENT_DIR, "data", "reservaciones.csv")
-        with open(clientes_file_path, "w") as fp:
-            csvwriter = csv.writer(
-                fp, delimiter=";", lineterminator="\n", quoting=csv.QUOTE_MINIMAL
-            )
-            for id, cliente in self.clientes.items():
-                csvwriter.writerow((id, cliente.nombre, cliente.email))
+        self._reescribir(
+            "clientes.csv",
+            (
+                (id, cliente.nombre, cliente.email)
+                for id, cliente in self.clientes.items()
+            ),
+        )
+
+        # El histórico se escribe primero para no perder las reservaciones que salen del archivo principal
+        self.archivo.guardar()
+
+        self._reescribir(
+            "reservaciones.csv", map(reservacion_a_fila, self.reservaciones)
+        )
+
+        self._guardar_cache(self._fuentes())
 
-        with open(reservaciones_file_path, "w") as fp:
-            csvwriter = csv.writer(
-                fp, delimiter=";", lineterminator="\n", quoting=csv.QUOTE_MINIMAL
+        print_info("Datos guardados")
+
+    def _fuentes(self) -> List[str]:
+        """Devuelve las rutas de los archivos de clientes y reservaciones.
+
+        De no haber datos en el directorio predeterminado, se usan los datos de muestra. En otro directorio (el de un
+        hotel de la cadena), se crean los archivos vacíos.
+        """
+        fuentes = []
+        for nombre in ("clientes.csv", "reservaciones.csv"):
+            ruta = self._ruta_archivo(nombre)
+            if not os.path.exists(ruta):
+                if self.directorio == DATA_DIR:
+                    ruta = os.path.join(CURRENT_DIR, "seeds", nombre)
+                else:
+                    os.makedirs(self.directorio, exist_ok=True)
+                    abrir(ruta, "w").close()
+            fuentes.append(ruta)
+
+        return fuentes
+
+    def _guardar_cache(self, fuentes: List[str]):
+        """Guarda el estado cargado para el próximo arranque"""
+        try:
+            self.cache.guardar(
+                fuentes,
+                {
+                    "clientes": self.clientes,
+                    "reservaciones": self.reservaciones,
+                    "pendientes": self.archivo.pendientes,
+                    "max_id": max(self.por_id, default=0),
+                },
             )
-            for reservacion in self.reservaciones:
-                id = reservacion.id
-                cliente_ci = reservacion.cliente.ci
-                habitacion = reservacion.habitacion
-                estado = reservacion.estado
-                fecha_entrada = reservacion.fecha_entrada.strftime("%Y-%m-%d")
-                fecha_salida = reservacion.fecha_salida.strftime("%Y-%m-%d")
-                hora_entrada = reservacion.hora_entrada.strftime("%H:%M")
-                hora_salida = reservacion.hora_salida.strftime("%H:%M")
-                precio = reservacion.precio
-                personas_count = reservacion.personas_count
-                observaciones = reservacion.observaciones
-                csvwriter.writerow(
-                    (
-                        id,
-                        cliente_ci,
-                        habitacion,
-                        estado,
-                        fecha_entrada,
-                        fecha_salida,
-                        hora_entrada,
-                        hora_salida,
-                        precio,
-                        personas_count,
-                        observaciones,
-                    )
+        except OSError:
+            print_error("No se pudo guardar el caché de datos")
+
+    def _restaurar(self, estado: dict):
+        """Restaura el estado guardado en el caché.
+
+        Las reservaciones que dejaron de ser recientes desde que se guardó el caché se mueven al histórico.
+        """
+        self.clientes.update(estado["clientes"])
+        for cliente in estado["clientes"].values():
+            self.busqueda_clientes.agregar(cliente.ci, cliente.nombre, cliente.email)
+        for anio, filas in estado["pendientes"].items():
+            self.archivo.pendientes.setdefault(anio, []).extend(filas)
+        self.generador_ids.observar(estado["max_id"])
+
+        for reservacion in estado["reservaciones"]:
+            if reservacion.fecha_salida < self.corte:
+                self._indexar(
+                    self.archivo.archivar(reservacion_a_fila(reservacion), self.clientes)
                 )
+            else:
+                self.agregar_reservacion(reservacion)
 
-        print_info("Datos guardados")
+    def _ruta_datos(self, nombre: str) -> str:
+        """Devuelve la ruta de un archivo de datos"""
+        return os.path.join(self.directorio, nombre)
+
+    def _ruta_archivo(self, nombre: str) -> str:
+        """Devuelve la ruta con la que está en disco un archivo de datos, comprimido o no.
+
+        Si el archivo no existe, la ruta tiene la extensión del formato de compresión configurado.
+        """
+        ruta = self._ruta_datos(nombre)
+        return buscar(ruta) or con_codec(ruta, self.compresion)
+
+    def _reescribir(self, nombre: str, filas):
+        """Reescribe un archivo de datos con el formato de compresión configurado.
+
+        Si el archivo estaba en otro formato, se borra la versión anterior.
+        """
+        ruta = con_codec(self._ruta_datos(nombre), self.compresion)
+        with abrir(ruta, "w") as fp:
+            csvwriter = escritor_filas(fp)
+            for fila in filas:
+                csvwriter.writerow(fila)
+
+        for variante in variantes(self._ruta_datos(nombre)):
+            if variante != ruta and os.path.exists(variante):
+                os.remove(variante)
+
+    def _registrar_cambio(self, archivo: str, fila):
+        """Persiste un cambio agregando la fila al final del archivo de datos.
+
+        Al cargar, la última fila de cada ID es la vigente; las filas de reservaciones deben llevar la marca de
+        :func:`archivo.fila_de_cambio` para que no se tomen como otra reservación con el mismo ID. Si aún no existen
+        archivos de datos (se cargaron los datos de muestra), se persiste el estado completo.
+        """
+        ruta = buscar(self._ruta_datos(archivo))
+        if ruta is None:
+            self.persistir()
+            return
+
+        with abrir(ruta, "a") as fp:
+            escritor_filas(fp).writerow(fila)
 
     ## Operaciones de la App
 
+    def _indexar(self, reservacion: Reservacion):
+        """Agrega una reservación en memoria a los índices"""
+        if reservacion is None:
+            return
+
+        self.version += 1
+        self.por_id[reservacion.id] = reservacion
+        self.por_cliente.agregar(reservacion)
+        if self.es_residente(reservacion):
+            self.por_campos.agregar(reservacion)
+        if reservacion.estado != ReservacionEstado.Cancelada:
+            self.asignador.ocupar(reservacion)
+        if reservacion.observaciones:
+            self.busqueda_reservaciones.agregar(reservacion.id, reservacion.observaciones)
+
+    def _desindexar(self, reservacion: Reservacion):
+        """Quita una reservación de los índices que dependen de sus campos"""
+        self.version += 1
+        self.por_cliente.quitar(reservacion)
+        self.por_campos.quitar(reservacion)
+        self.asignador.liberar(reservacion)
+        self.busqueda_reservaciones.quitar(reservacion.id)
+
+    def agregar_reservacion(self, reservacion: Reservacion):
+        """Agrega una reservación a las reservaciones en memoria y a los índices"""
+        self.reservaciones.append(reservacion)
+        self._indexar(reservacion)
+
     def esta_ocupada(
         self,
         habitacion: str,
@@ -179,72 +416,354 @@ class App:
         fecha_final: datetime.datetime,
     ):
         """Devuelve si la habitación está ocupada en el rango de fechas."""
-        reservaciones = filter(lambda r: r.habitacion == habitacion, self.reservaciones)
-        reservaciones = filter(
-            lambda r: r.fecha_entrada >= fecha_inicial
-            and r.fecha_salida <= fecha_final,
-            reservaciones,
-        )
+        if fecha_inicial < self.corte:
+            self.cargar_historico(fecha_inicial, fecha_final)
+
+        return not self.asignador.esta_libre(habitacion, fecha_inicial, fecha_final)
+
+    def disponibilidad(
+        self,
+        fecha_inicial: datetime.datetime,
+        fecha_final: datetime.datetime,
+        personas_count=1,
+    ) -> Dict[str, str]:
+        """Devuelve, para cada tipo de habitación con capacidad suficiente, la habitación libre que se asignaría.
 
-        return len(reservaciones)
+        Los tipos sin habitaciones libres en el rango de fechas no se incluyen.
+        """
+        if fecha_inicial < self.corte:
+            self.cargar_historico(fecha_inicial, fecha_final)
+
+        disponibles = {}
+        for tipo in self.catalogo.tipos_para(personas_count):
+            habitacion = self.asignador.asignar(tipo, fecha_inicial, fecha_final)
+            if habitacion is not None:
+                disponibles[tipo] = habitacion
+
+        return disponibles
 
     def capacidad(self, habitacion: str) -> int:
         """Devuelve la capacidad de la habitación."""
-        if not self.tiene_habitacion(habitacion):
-            return 0
-
-        return HabitacionTipo(self.habitaciones[habitacion]).capacidad()
+        return self.catalogo.capacidad.get(habitacion, 0)
 
     def tiene_habitacion(self, habitacion: str):
         """Devuelve si la habitación existe."""
-        return habitacion in self.habitaciones
+        return habitacion in self.catalogo
 
     def tipo_habitacion(self, habitacion: str):
         """Devuelve el tipo de la habitación."""
-        if self.tiene_habitacion(habitacion):
-            return self.habitaciones[habitacion]
-        return None
+        return self.catalogo.tipo.get(habitacion)
+
+    @metricas.medir("app.cargar_historico")
+    def cargar_historico(
+        self,
+        fecha_inicial: datetime.datetime = None,
+        fecha_final: datetime.datetime = None,
+    ):
+        """Carga en memoria las particiones del histórico que alcanzan el rango de fechas, para que sus ocupaciones se
+        tengan en cuenta al consultar la disponibilidad.
+
+        Sin fechas, se carga el histórico completo.
+        """
+        for reservacion in self.archivo.cargar_rango(
+            self.clientes, fecha_inicial, fecha_final, self.por_id
+        ):
+            self._indexar(reservacion)
+
+    def todas_las_reservaciones(self):
+        """Itera todas las reservaciones, incluyendo el histórico completo.
+
+        Las particiones del histórico que no están en memoria se leen de a una y no se mantienen.
+        """
+        return itertools.chain(
+            self.archivo.cargadas(),
+            self.archivo.recorrer(self.clientes, excluir=self.por_id),
+            self.reservaciones,
+        )
 
     def get_reservaciones_por_periodo(
         self, fecha_inicial: datetime.datetime, fecha_final: datetime.datetime
     ):
         """Devuelve las reservaciones que se encuentran en el rango de fechas."""
 
+        reservaciones = self.reservaciones
+        if fecha_inicial < self.corte:
+            reservaciones = itertools.chain(
+                self.archivo.cargadas(),
+                self.archivo.recorrer(
+                    self.clientes, fecha_inicial, fecha_final, self.por_id
+                ),
+                reservaciones,
+            )
+
         return filter(
             lambda r: r.fecha_entrada < fecha_final and r.fecha_salida > fecha_inicial,
-            self.reservaciones,
+            reservaciones,
         )
 
-    def reporte_en_periodo(
+    def get_reservacion(self, id: int) -> Reservacion:
+        """Devuelve la reservación con el ID.
+
+        Si no está en memoria, se busca en el histórico sin cargarlo.
+        """
+        reservacion = self.por_id.get(id)
+        if reservacion is None:
+            reservacion = next(
+                (
+                    r
+                    for r in self.archivo.recorrer(self.clientes, excluir=self.por_id)
+                    if r.id == id
+                ),
+                None,
+            )
+
+        return reservacion
+
+    def es_residente(self, reservacion: Reservacion) -> bool:
+        """Devuelve si la reservación está en el archivo principal y no en el histórico."""
+        return reservacion.fecha_salida >= self.corte
+
+    def _get_reservacion_modificable(self, id: int) -> Reservacion:
+        reservacion = self.por_id.get(id)
+        if reservacion is None or not self.es_residente(reservacion):
+            raise ValueError("La reservación %s no existe o es parte del histórico" % id)
+
+        return reservacion
+
+    def cambiar_estado(self, id: int, estado: ReservacionEstado) -> Reservacion:
+        """Cambia el estado de una reservación.
+
+        :raises ValueError: si la reservación no se puede modificar o el cambio de estado no es válido
+        """
+        reservacion = self._get_reservacion_modificable(id)
+        if estado not in reservacion.estado.transiciones():
+            raise ValueError(
+                "Una reservación %s no puede pasar a %s" % (reservacion.estado, estado)
+            )
+
+        self._desindexar(reservacion)
+        reservacion.estado = estado
+        self._indexar(reservacion)
+
+        fila = reservacion_a_fila(reservacion)
+        self._registrar_cambio("reservaciones.csv", fila_de_cambio(fila))
+        self.cambios.publicar(
+            TipoCambio.Cancelada
+            if estado == ReservacionEstado.Cancelada
+            else TipoCambio.Estado,
+            fila,
+        )
+
+        return reservacion
+
+    def abonar(self, id: int) -> Reservacion:
+        """Marca la reservación como abonada"""
+        return self.cambiar_estado(id, ReservacionEstado.Abonada)
+
+    def pagar(self, id: int) -> Reservacion:
+        """Marca la reservación como pagada"""
+        return self.cambiar_estado(id, ReservacionEstado.Pagada)
+
+    def cancelar(self, id: int) -> Reservacion:
+        """Cancela la reservación"""
+        return self.cambiar_estado(id, ReservacionEstado.Cancelada)
+
+    CAMPOS_MODIFICABLES = (
+        "habitacion",
+        "fecha_entrada",
+        "fecha_salida",
+        "hora_entrada",
+        "hora_salida",
+        "precio",
+        "personas_count",
+        "observaciones",
+    )
+
+    def modificar_reservacion(self, id: int, **cambios) -> Reservacion:
+        """Modifica los campos de una reservación.
+
+        Los campos que se pueden modificar están en :attr:`CAMPOS_MODIFICABLES`. El estado se cambia con
+        :meth:`cambiar_estado`.
+
+        :raises ValueError: si la reservación no se puede modificar, algún campo no es válido o la habitación está
+            ocupada por otra reservación en las fechas nuevas
+        """
+        reservacion = self._get_reservacion_modificable(id)
+        for campo in cambios:
+            if campo not in self.CAMPOS_MODIFICABLES:
+                raise ValueError("El campo '%s' no se puede modificar" % campo)
+        if "habitacion" in cambios and not self.tiene_habitacion(cambios["habitacion"]):
+            raise ValueError("La habitación %s no existe" % cambios["habitacion"])
+
+        habitacion = cambios.get("habitacion", reservacion.habitacion)
+        fecha_entrada = cambios.get("fecha_entrada", reservacion.fecha_entrada)
+        fecha_salida = cambios.get("fecha_salida", reservacion.fecha_salida)
+        if fecha_entrada < self.corte:
+            self.cargar_historico(fecha_entrada, fecha_salida)
+
+        self._desindexar(reservacion)
+        # La reservación ya no ocupa su habitación, así que solo puede chocar con otras
+        if (
+            reservacion.estado != ReservacionEstado.Cancelada
+            and not self.asignador.esta_libre(habitacion, fecha_entrada, fecha_salida)
+        ):
+            self._indexar(reservacion)
+            raise _error_ocupada(habitacion, fecha_entrada, fecha_salida)
+
+        for campo, valor in cambios.items():
+            setattr(reservacion, campo, valor)
+        self._indexar(reservacion)
+
+        fila = reservacion_a_fila(reservacion)
+        self._registrar_cambio("reservaciones.csv", fila_de_cambio(fila))
+        self.cambios.publicar(TipoCambio.Modificada, fila)
+
+        return reservacion
+
+    def registrar_cliente(self, ci: str, nombre: str, email: str) -> Cliente:
+        """Registra un cliente nuevo"""
+        cliente = Cliente(ci, nombre, email)
+        self.clientes[ci] = cliente
+        self.busqueda_clientes.agregar(ci, nombre, email)
+        self.version += 1
+        self._registrar_cambio("clientes.csv", (ci, nombre, email))
+
+        return cliente
+
+    @metricas.medir("app.buscar_clientes")
+    def buscar_clientes(self, consulta: str, limite=20) -> List[Cliente]:
+        """Busca clientes por nombre o email.
+
+        Cada palabra de la consulta puede ser parte de cualquier palabra del nombre o el email (las de dos caracteres,
+        solo el inicio). Los resultados vienen de la mejor coincidencia a la peor.
+        """
+        return [
+            self.clientes[ci] for ci in self.busqueda_clientes.buscar(consulta, limite)
+        ]
+
+    @metricas.medir("app.buscar_reservaciones")
+    def buscar_reservaciones(self, consulta: str, limite=20) -> List[Reservacion]:
+        """Busca reservaciones por sus observaciones, incluyendo el histórico completo.
+
+        Las observaciones del histórico se agregan a la búsqueda la primera vez, sin mantener sus reservaciones en
+        memoria; las reservaciones encontradas se leen de sus particiones. Los resultados vienen de la mejor
+        coincidencia a la peor.
+        """
+        if self._anios_busqueda is None:
+            self._anios_busqueda = {}
+            for reservacion in self.archivo.recorrer(self.clientes, excluir=self.por_id):
+                if reservacion.observaciones:
+                    self.busqueda_reservaciones.agregar(
+                        reservacion.id, reservacion.observaciones
+                    )
+                    self._anios_busqueda[reservacion.id] = reservacion.fecha_salida.year
+
+        ids = self.busqueda_reservaciones.buscar(consulta, limite)
+        faltantes = {id for id in ids if id not in self.por_id}
+        encontradas = {
+            r.id: r
+            for r in self.archivo.recorrer(
+                self.clientes,
+                excluir=self.por_id,
+                anios=sorted({self._anios_busqueda[id] for id in faltantes}),
+            )
+            if r.id in faltantes
+        }
+
+        return [self.por_id.get(id) or encontradas[id] for id in ids]
+
+    def seguir_cambios(self, desde: int = 0) -> Iterator[Cambio]:
+        """Itera los cambios de las reservaciones posteriores a la secuencia `desde`.
+
+        Ver :meth:`cambios.FeedCambios.seguir`.
+        """
+        return self.cambios.seguir(desde)
+
+    def _historico_cliente(self, ci: str) -> List[Reservacion]:
+        """Devuelve las reservaciones del cliente en las particiones del histórico que no están en memoria.
+
+        Solo se leen las particiones en las que el cliente tiene reservaciones (ver
+        :meth:`archivo.ArchivoReservaciones.anios_cliente`).
+        """
+        return [
+            reservacion
+            for reservacion in self.archivo.recorrer(
+                self.clientes, excluir=self.por_id, anios=self.archivo.anios_cliente(ci)
+            )
+            if reservacion.cliente.ci == ci
+        ]
+
+    def historial_cliente(self, ci: str) -> List[Reservacion]:
+        """Devuelve todas las reservaciones del cliente ordenadas por fecha de entrada."""
+        historico = self._historico_cliente(ci)
+        if len(historico) == 0:
+            return self.por_cliente.historial(ci)
+
+        return sorted(
+            itertools.chain(historico, self.por_cliente.historial(ci)),
+            key=lambda r: r.fecha_entrada,
+        )
+
+    def resumen_cliente(self, ci: str) -> ResumenCliente:
+        """Devuelve los acumulados de todas las reservaciones del cliente."""
+        resumen = copy.copy(self.por_cliente.resumen(ci))
+        for reservacion in self._historico_cliente(ci):
+            resumen.sumar(reservacion)
+
+        return resumen
+
+    def _a_ordenable(self, reservacion: Reservacion, clave) -> Ordenable:
+        """Prepara una reservación para el ordenamiento externo.
+
+        Las reservaciones en memoria se ordenan por ID, para que, si se usa el disco, se escriban solo los IDs y las
+        claves. Las del histórico que no están en memoria se ordenan con su fila.
+        """
+        if reservacion.id in self.por_id:
+            return Ordenable(reservacion.id, clave)
+
+        return Ordenable(reservacion_a_fila(reservacion), clave)
+
+    def _de_ordenable(self, ordenable: Ordenable) -> Reservacion:
+        """Devuelve la reservación de un elemento creado con :meth:`_a_ordenable`"""
+        if isinstance(ordenable.data, int):
+            return self.por_id[ordenable.data]
+
+        return fila_a_reservacion(ordenable.data, self.clientes)
+
+    def iter_reporte_en_periodo(
         self, fecha_inicial: datetime.datetime, fecha_final: datetime.datetime, asc=True
     ):
-        """Devuelve un reporte de las reservaciones que se encuentran en el rango de fechas ordenadas por precio."""
+        """Itera las reservaciones que se encuentran en el rango de fechas ordenadas por precio."""
 
         reservaciones = self.get_reservaciones_por_periodo(fecha_inicial, fecha_final)
 
         if asc:
-            reservaciones = map(lambda r: Ordenable(r, r.precio), reservaciones)
+            reservaciones = map(lambda r: self._a_ordenable(r, r.precio), reservaciones)
         else:
-            reservaciones = map(lambda r: Ordenable(r, -r.precio), reservaciones)
-
-        reservaciones = list(reservaciones)
-        mergesort(reservaciones)
+            reservaciones = map(lambda r: self._a_ordenable(r, -r.precio), reservaciones)
 
-        return [ordenable.data for ordenable in reservaciones]
+        for ordenable in ordenar_externo(
+            reservaciones, self.presupuesto_ordenamiento, respaldo=mergesort
+        ):
+            yield self._de_ordenable(ordenable)
 
-    def reporte_cant_reservaciones(self, asc=True):
-        """Devuelve un reporte de los mejores clientes.
+    @metricas.medir("app.reporte_en_periodo")
+    @memoizar("app.reporte_en_periodo")
+    def reporte_en_periodo(
+        self, fecha_inicial: datetime.datetime, fecha_final: datetime.datetime, asc=True
+    ):
+        """Devuelve un reporte de las reservaciones que se encuentran en el rango de fechas ordenadas por precio."""
 
-        El criterio utilizado es la cantidad de reservaciones.
-        """
+        return list(self.iter_reporte_en_periodo(fecha_inicial, fecha_final, asc))
 
-        clientes_count = {}
+    def iter_reporte_cant_reservaciones(self, asc=True):
+        """Itera los mejores clientes según la cantidad de reservaciones."""
 
-        for r in self.reservaciones:
-            if r.cliente.ci not in clientes_count:
-                clientes_count[r.cliente.ci] = 1
-            else:
-                clientes_count[r.cliente.ci] += 1
+        clientes_count = dict(self.por_cliente.cantidades())
+        # Las particiones del histórico que no están en memoria se cuentan al recorrerlas
+        for reservacion in self.archivo.recorrer(self.clientes, excluir=self.por_id):
+            ci = reservacion.cliente.ci
+            clientes_count[ci] = clientes_count.get(ci, 0) + 1
 
         resultados = []
         if asc:
@@ -258,33 +777,50 @@ class App:
                 clientes_count.items(),
             )
 
-        resultados = list(resultados)
-        shellsort(resultados)
+        for ordenable in ordenar_externo(
+            resultados, self.presupuesto_ordenamiento, respaldo=shellsort
+        ):
+            yield MejorCliente(
+                self.clientes[ordenable.data], clientes_count[ordenable.data]
+            )
 
-        return [
-            MejorCliente(self.clientes[ordenable.data], clientes_count[ordenable.data])
-            for ordenable in resultados
-        ]
+    @metricas.medir("app.reporte_cant_reservaciones")
+    @memoizar("app.reporte_cant_reservaciones")
+    def reporte_cant_reservaciones(self, asc=True):
+        """Devuelve un reporte de los mejores clientes.
 
-    def reporte_estadia(self, asc=True):
-        """Devuelve un reporte de las reservaciones ordenadas por duración de estadía."""
+        El criterio utilizado es la cantidad de reservaciones.
+        """
 
-        reservaciones = self.reservaciones
+        return list(self.iter_reporte_cant_reservaciones(asc))
+
+    def iter_reporte_estadia(self, asc=True):
+        """Itera las reservaciones ordenadas por duración de estadía."""
+
+        reservaciones = self.todas_las_reservaciones()
 
         if asc:
             reservaciones = map(
-                lambda r: Ordenable(r, r.duracion()), self.reservaciones
+                lambda r: self._a_ordenable(r, r.duracion()), reservaciones
             )
         else:
             reservaciones = map(
-                lambda r: Ordenable(r, -r.duracion()), self.reservaciones
+                lambda r: self._a_ordenable(r, -r.duracion()), reservaciones
             )
 
-        reservaciones = list(reservaciones)
-        heapsort(reservaciones)
+        for ordenable in ordenar_externo(
+            reservaciones, self.presupuesto_ordenamiento, respaldo=heapsort
+        ):
+            yield self._de_ordenable(ordenable)
 
-        return [ordenable.data for ordenable in reservaciones]
+    @metricas.medir("app.reporte_estadia")
+    @memoizar("app.reporte_estadia")
+    def reporte_estadia(self, asc=True):
+        """Devuelve un reporte de las reservaciones ordenadas por duración de estadía."""
 
+        return list(self.iter_reporte_estadia(asc))
+
+    @metricas.medir("app.crear_reservacion")
     def crear_reservacion(
         self,
         cliente_ci: str,
@@ -296,9 +832,21 @@ class App:
         personas_count=1,
         observaciones=None,
     ) -> Reservacion:
-        precio_por_dia = self.precios[self.habitaciones[habitacion]]
-        duracion_dias = (fecha_salida - fecha_entrada).days
-        precio = precio_por_dia * duracion_dias
+        """Crea una reservación pendiente en la habitación.
+
+        La disponibilidad se comprueba al crear la reservación, por lo que dos pedidos por la misma habitación y
+        fechas no la reservan dos veces aunque ambos la hayan visto libre en :meth:`disponibilidad`.
+
+        :raises ValueError: si la habitación no existe o está ocupada en esas fechas
+        """
+        if not self.tiene_habitacion(habitacion):
+            raise ValueError("La habitación %s no existe" % habitacion)
+        if self.esta_ocupada(habitacion, fecha_entrada, fecha_salida):
+            raise _error_ocupada(habitacion, fecha_entrada, fecha_salida)
+
+        precio = self.motor_precios.cotizar(
+            self.habitaciones[habitacion], fecha_entrada, fecha_salida
+        )
 
         r = Reservacion(
             self.clientes[cliente_ci],
@@ -311,10 +859,14 @@ class App:
             hora_salida,
             personas_count,
             observaciones,
+            id=self.generador_ids.siguiente(),
         )
 
-        self.reservaciones.append(r)
-        self.persistir()
+        self.agregar_reservacion(r)
+
+        fila = reservacion_a_fila(r)
+        self._registrar_cambio("reservaciones.csv", fila_de_cambio(fila))
+        self.cambios.publicar(TipoCambio.Creada, fila)
 
         return r
 
@@ -327,6 +879,10 @@ class App:
     VISTA_REPORTE_DEL_PERIODO = 3
     VISTA_REPORTE_MEJORES_CLIENTES = 4
     VISTA_REPORTE_DURACION = 5
+    VISTA_HISTORIAL_CLIENTE = 6
+    VISTA_GESTIONAR_RESERVACION = 7
+    VISTA_EXPORTAR = 8
+    VISTA_BUSCAR = 9
 
     def run(self):
         """Ejecuta el TUI de la aplicación"""
@@ -336,6 +892,12 @@ class App:
         vista = self.VISTA_MENU
 
         while True:
+            try:
+                if self.recargar_config():
+                    print_info("Configuración recargada")
+            except ValueError as e:
+                print_error("No se pudo recargar la configuración: %s" % e)
+
             if vista == self.VISTA_SALIR:
                 return
 
@@ -357,6 +919,18 @@ class App:
             elif vista == self.VISTA_REPORTE_DURACION:
                 vista = self.vista_reporte_duracion_estadias(vista)
 
+            elif vista == self.VISTA_HISTORIAL_CLIENTE:
+                vista = self.vista_historial_cliente(vista)
+
+            elif vista == self.VISTA_GESTIONAR_RESERVACION:
+                vista = self.vista_gestionar_reservacion(vista)
+
+            elif vista == self.VISTA_EXPORTAR:
+                vista = self.vista_exportar(vista)
+
+            elif vista == self.VISTA_BUSCAR:
+                vista = self.vista_buscar(vista)
+
             else:
                 vista == self.VISTA_SALIR
 
@@ -370,12 +944,16 @@ class App:
         opciones = [
             ["Reservar", self.VISTA_RESERVAR],
             ["Ver reservaciones", self.VISTA_LISTAR],
+            ["Gestionar reservación", self.VISTA_GESTIONAR_RESERVACION],
             [
                 "Reporte: reservaciones en período",
                 self.VISTA_REPORTE_DEL_PERIODO,
             ],
             ["Reporte: mejores clientes", self.VISTA_REPORTE_MEJORES_CLIENTES],
             ["Reporte: duración de estadías", self.VISTA_REPORTE_DURACION],
+            ["Historial de cliente", self.VISTA_HISTORIAL_CLIENTE],
+            ["Buscar", self.VISTA_BUSCAR],
+            ["Exportar reporte", self.VISTA_EXPORTAR],
             ["Salir", self.VISTA_SALIR],
         ]
 
@@ -393,30 +971,29 @@ class App:
 
         fecha_inicial = leer_date("Indique la fecha en la que desea llegar")
         fecha_final = leer_date("Indique la fecha en la que desea salir")
+        if not self.motor_precios.en_limites(fecha_inicial, fecha_final):
+            # Seguramente un año mal escrito, como 0202
+            print_error("Las fechas están demasiado lejos de hoy")
+            return self.VISTA_MENU
         personas_count = leer_numero("Indique el número de personas que se quedarán", 1)
 
-        reservaciones_del_periodo = set(
-            r.habitacion
-            for r in self.get_reservaciones_por_periodo(fecha_inicial, fecha_final)
-        )
-        tipos_utiles = [t for t in HabitacionTipo if t.capacidad() >= personas_count]
+        disponibles = self.disponibilidad(fecha_inicial, fecha_final, personas_count)
+        tipos_utiles = list(disponibles)
 
-        habitaciones_disponibles = []
-        for h, tipo in self.habitaciones.items():
-            if h not in reservaciones_del_periodo and tipo in tipos_utiles:
-                habitaciones_disponibles.append(h)
-
-        if len(habitaciones_disponibles) < 0:
+        if len(tipos_utiles) == 0:
             print_info(
                 "No tenemos habitaciones disponibles en ese período para esa cantidad de personas"
             )
             return self.VISTA_MENU
 
+        duracion_dias = (fecha_final - fecha_inicial).days
+
         print_info("Tenemos habitaciones disponibles")
-        for tipo, precio in self.precios.items():
-            if tipo not in tipos_utiles:
-                continue
-            print(f"  - {HabitacionTipo(tipo).label()} en {precio}")
+        for tipo in tipos_utiles:
+            precio = self.motor_precios.cotizar(tipo, fecha_inicial, fecha_final)
+            print(
+                f"  - {self.catalogo.label(tipo)} en {precio} por {duracion_dias} día(s)"
+            )
 
         if not leer_si_no(
             "¿Desa proceder con la reservación con alguna de estas opciones?"
@@ -425,18 +1002,15 @@ class App:
 
         tipo_seleccionado = seleccionar_opcion(
             "Indique el tipo de habitación",
-            [HabitacionTipo(tipo).label() for tipo in tipos_utiles],
+            [self.catalogo.label(tipo) for tipo in tipos_utiles],
             tipos_utiles,
         )
 
-        duracion_dias = (fecha_final - fecha_inicial).days
-        precio = duracion_dias * self.precios[tipo_seleccionado]
+        precio = self.motor_precios.cotizar(
+            tipo_seleccionado, fecha_inicial, fecha_final
+        )
 
-        habitacion = None
-        for h in habitaciones_disponibles:
-            if self.tipo_habitacion(h) == tipo_seleccionado:
-                habitacion = h
-                break
+        habitacion = disponibles[tipo_seleccionado]
 
         if not leer_si_no(
             f"Sería un total de {precio} por la habitación {habitacion} por {duracion_dias} día(s) ¿Desa proceder?"
@@ -447,12 +1021,18 @@ class App:
         if ci in self.clientes:
             print_info("Este cliente ya está registrado.")
             print_info(self.clientes[ci].nombre)
+
+            resumen = self.por_cliente.resumen(ci)
+            if resumen.reservaciones_count > 0:
+                print_info(
+                    f"Cliente frecuente: {resumen.reservaciones_count} reservación(es) recientes, {resumen.noches} noche(s)"
+                )
         else:
             print_info("Este cliente no esta registrado. Vamos a solucionarlo.")
             nombre = leer_str("¿Cuál es el nombre del cliente?")
             email = leer_email("¿Cuál es el email del cliente?")
 
-            self.clientes[ci] = Cliente(ci, nombre, email)
+            self.registrar_cliente(ci, nombre, email)
             print_info("Cliente registrado.")
 
         observaciones = leer_str(
@@ -483,19 +1063,36 @@ class App:
         )
 
     def reservaciones_ordenadas(self):
-        """Ordena las reservaciones"""
+        """Ordena las reservaciones en memoria que cumplen el filtro según el ordenamiento seleccionado.
+
+        Las reservaciones del histórico no se incluyen.
+        """
+        return self._reservaciones_ordenadas(
+            tuple(self.ordenamiento), tuple(self.filtro)
+        )
+
+    def filtrar_reservaciones(self, filtro: List[filtros.Filtro]) -> List[Reservacion]:
+        """Devuelve las reservaciones en memoria que cumplen todos los filtros, en el orden de la lista.
 
-        ordenados = list(self.reservaciones)
-        if len(self.ordenamiento) > 0:
-            for ordenamiento in self.ordenamiento[::-1]:
+        Solo se recorren las reservaciones que cumplen el filtro más selectivo.
+        """
+        return self.por_campos.filtrar(filtro)
+
+    @metricas.medir("app.reservaciones_ordenadas")
+    @memoizar("app.reservaciones_ordenadas")
+    def _reservaciones_ordenadas(self, criterios: tuple, filtro: tuple = ()):
+        if len(filtro) > 0:
+            ordenados = self.filtrar_reservaciones(list(filtro))
+        else:
+            ordenados = list(self.reservaciones)
+        if len(criterios) > 0:
+            for ordenamiento in criterios[::-1]:
                 getter = PARAMETROS_ORDEN[abs(ordenamiento)][1]
 
+                # Cada criterio se aplica con un ordenamiento estable, empezando por el menos importante
                 ordenables = [Ordenable(r, getter(r)) for r in ordenados]
-                quicksort(ordenables)
-                if ordenamiento < 0:
-                    ordenados = [r.data for r in ordenables[::-1]]
-                else:
-                    ordenados = [r.data for r in ordenables]
+                ordenar(ordenables, ordenamiento < 0, respaldo=mergesort)
+                ordenados = [r.data for r in ordenables]
 
         return ordenados
 
@@ -550,8 +1147,26 @@ class App:
 
             return True
 
+        def seleccionar_filtro():
+            while True:
+                print_info(filtros.AYUDA)
+                texto = leer_str(
+                    "Indique el filtro o presione <enter> sin escribir nada para quitarlo:"
+                )
+
+                try:
+                    self.filtro = filtros.leer_filtro(texto)
+                except ValueError as e:
+                    print_error(str(e))
+                    continue
+
+                break
+
+            return True
+
         opciones = [
             ["Ordenar", seleccionar_orden],
+            ["Filtrar", seleccionar_filtro],
             ["Volver al menú", lambda: False],
         ]
 
@@ -560,6 +1175,8 @@ class App:
                 "Reservaciones ordenadas:",
                 self.format_ordenamiento(),
             )
+            if len(self.filtro) > 0:
+                print_info("Filtro:", filtros.formatear(self.filtro))
             print_tabla_reservaciones(self.reservaciones_ordenadas())
             print()
 
@@ -614,3 +1231,122 @@ class App:
         input("Presione <enter> para volver al menú > ")
 
         return self.VISTA_MENU
+
+    def vista_historial_cliente(self, vista=None):
+        print_seccion(self.hotel + " - Historial de cliente")
+
+        ci = "{:0>8}".format(leer_numero("Indique la C.I. del cliente"))
+        if ci not in self.clientes:
+            print_error("Este cliente no está registrado")
+            return self.VISTA_MENU
+
+        reservaciones = self.historial_cliente(ci)
+        resumen = self.resumen_cliente(ci)
+
+        print_info(str(self.clientes[ci]))
+        print_info(
+            f"{resumen.reservaciones_count} reservación(es), {resumen.noches} noche(s), {resumen.gasto} en total"
+        )
+        print()
+        print_tabla_reservaciones(reservaciones)
+        input("Presione <enter> para volver al menú > ")
+
+        return self.VISTA_MENU
+
+    def vista_gestionar_reservacion(self, vista=None):
+        print_seccion(self.hotel + " - Gestionar reservación")
+
+        reservacion = self.get_reservacion(leer_numero("Indique el ID de la reservación"))
+        if reservacion is None:
+            print_error("La reservación no existe")
+            return self.VISTA_MENU
+
+        print(reservacion)
+
+        def modificar_observaciones():
+            observaciones = leer_str(
+                "Indique las nuevas observaciones (presione <enter> para dejar el campo vacío)"
+            )
+            return self.modificar_reservacion(
+                reservacion.id, observaciones=observaciones or None
+            )
+
+        opciones = [
+            ["Abonar", lambda: self.abonar(reservacion.id)],
+            ["Pagar", lambda: self.pagar(reservacion.id)],
+            ["Cancelar", lambda: self.cancelar(reservacion.id)],
+            ["Modificar observaciones", modificar_observaciones],
+            ["Volver al menú", lambda: None],
+        ]
+
+        accion = seleccionar_opcion(
+            "Seleccione una operación",
+            [o[0] for o in opciones],
+            [o[1] for o in opciones],
+        )
+
+        try:
+            if accion() is not None:
+                print_info("Reservación actualizada")
+                print(reservacion)
+        except ValueError as e:
+            print_error(str(e))
+
+        return self.VISTA_MENU
+
+    def vista_exportar(self, vista=None):
+        print_seccion(self.hotel + " - Exportar reporte")
+
+        reporte = seleccionar_opcion(
+            "Seleccione el reporte",
+            [
+                "Reservaciones en período",
+                "Mejores clientes",
+                "Duración de estadías",
+            ],
+            ["periodo", "mejores_clientes", "estadias"],
+        )
+
+        parametros = {}
+        if reporte == "periodo":
+            parametros["fecha_inicial"] = leer_date("Ingrese fecha inicial")
+            parametros["fecha_final"] = leer_date("Ingrese fecha final")
+
+        asc = not leer_si_no("¿Desea orden descendente?")
+        formato = seleccionar_opcion("Seleccione el formato", list(exportar.FORMATOS))
+        ruta = leer_str("Indique la ruta del archivo")
+
+        try:
+            count = exportar.exportar_reporte(
+                self, reporte, ruta, formato, asc, **parametros
+            )
+        except OSError as e:
+            print_error("No se pudo exportar el reporte: %s" % e)
+            return self.VISTA_MENU
+
+        print_info("%d fila(s) exportada(s) a %s" % (count, ruta))
+
+        return self.VISTA_MENU
+
+    def vista_buscar(self, vista=None):
+        print_seccion(self.hotel + " - Buscar")
+
+        buscar = seleccionar_opcion(
+            "¿Qué desea buscar?",
+            ["Clientes (nombre o email)", "Reservaciones (observaciones)"],
+            [self.buscar_clientes, self.buscar_reservaciones],
+        )
+
+        consulta = leer_str("Indique el texto a buscar")
+        resultados = buscar(consulta)
+        if len(resultados) == 0:
+            print_error("No se encontraron resultados")
+            return self.VISTA_MENU
+
+        if buscar == self.buscar_clientes:
+            print_tabla_clientes(resultados)
+        else:
+            print_tabla_reservaciones(resultados)
+        input("Presione <enter> para volver al menú > ")
+
+        return self.VISTA_MENU
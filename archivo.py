@@ -0,0 +1,392 @@
+import csv
+import datetime
+import itertools
+import json
+import os
+from typing import Container, Dict, Iterable, Iterator, List, Set, Tuple
+
+from cache import huella
+from compresion import abrir, buscar, con_codec, sin_codec
+from data import Cliente, Reservacion, ReservacionEstado
+
+FORMATO_FECHA = "%Y-%m-%d"
+FORMATO_HORA = "%H:%M"
+
+# Última columna de las filas que se agregan al final del archivo de reservaciones por un cambio. Las filas sin esta
+# marca son reservaciones distintas, aunque repitan el ID.
+MARCA_CAMBIO = "cambio"
+
+# Cantidad de columnas de una fila de reservación sin marca
+COLUMNAS_FILA = 11
+
+
+def fila_a_reservacion(row, clientes: Dict[str, Cliente]) -> Reservacion:
+    """Construye una reservación a partir de una fila del CSV"""
+    (
+        id,
+        cliente_ci,
+        habitacion,
+        estado,
+        fecha_entrada,
+        fecha_salida,
+        hora_entrada,
+        hora_salida,
+        precio,
+        personas_count,
+        observaciones,
+    ) = row
+    fecha_entrada = datetime.datetime.strptime(fecha_entrada, FORMATO_FECHA)
+    fecha_salida = datetime.datetime.strptime(fecha_salida, FORMATO_FECHA)
+    hora_entrada = datetime.datetime.strptime(hora_entrada, FORMATO_HORA).time()
+    hora_salida = datetime.datetime.strptime(hora_salida, FORMATO_HORA).time()
+    precio = float(precio)
+    personas_count = int(personas_count)
+
+    return Reservacion(
+        clientes[cliente_ci],
+        habitacion,
+        ReservacionEstado(estado),
+        fecha_entrada,
+        fecha_salida,
+        precio,
+        hora_entrada,
+        hora_salida,
+        personas_count,
+        observaciones or None,
+        id=int(id),
+    )
+
+
+def reservacion_a_fila(reservacion: Reservacion):
+    """Convierte una reservación en una fila del CSV"""
+    return (
+        reservacion.id,
+        reservacion.cliente.ci,
+        reservacion.habitacion,
+        reservacion.estado,
+        reservacion.fecha_entrada.strftime(FORMATO_FECHA),
+        reservacion.fecha_salida.strftime(FORMATO_FECHA),
+        reservacion.hora_entrada.strftime(FORMATO_HORA),
+        reservacion.hora_salida.strftime(FORMATO_HORA),
+        reservacion.precio,
+        reservacion.personas_count,
+        reservacion.observaciones,
+    )
+
+
+def leer_filas(fp):
+    """Itera las filas de un archivo CSV de datos"""
+    return csv.reader(
+        fp,
+        delimiter=";",
+        lineterminator="\n",
+        quoting=csv.QUOTE_MINIMAL,
+    )
+
+
+def fila_de_cambio(fila) -> tuple:
+    """Marca una fila que se agrega al final del archivo de reservaciones como el cambio de una reservación"""
+    return (*fila, MARCA_CAMBIO)
+
+
+def es_cambio(fila) -> bool:
+    """Devuelve si la fila tiene la marca de :func:`fila_de_cambio`"""
+    return len(fila) > COLUMNAS_FILA and fila[COLUMNAS_FILA] == MARCA_CAMBIO
+
+
+def filas_unicas(filas) -> Dict[int, tuple]:
+    """Agrupa las filas de una partición del histórico por ID de reservación.
+
+    Una reservación se puede archivar más de una vez (por ejemplo, si se cerró el programa entre que se escribió la
+    partición y el archivo principal), por lo que la última fila de cada ID es la vigente. El diccionario mantiene la
+    posición de la primera aparición.
+    """
+    unicas = {}
+    for fila in filas:
+        unicas[int(fila[0])] = fila[:COLUMNAS_FILA]
+
+    return unicas
+
+
+def filas_vigentes(filas, generador_ids) -> Tuple[Dict[int, tuple], int]:
+    """Agrupa las filas del archivo principal de reservaciones por ID.
+
+    Las filas de cambio (ver :func:`fila_de_cambio`) reemplazan a la fila con su ID. Una fila sin marca con un ID ya
+    usado es otra reservación (los IDs de versiones anteriores podían repetirse) y recibe un ID nuevo de
+    `generador_ids`, después de que este observe el mayor ID del archivo.
+
+    :return: las filas vigentes por ID, en el orden de su primera aparición, y la cantidad de filas con ID nuevo
+    """
+    unicas = {}
+    repetidas = []
+    for fila in filas:
+        id = int(fila[0])
+        if es_cambio(fila):
+            unicas[id] = fila[:COLUMNAS_FILA]
+        elif id in unicas:
+            repetidas.append(fila)
+        else:
+            unicas[id] = fila
+
+    if len(unicas) > 0:
+        generador_ids.observar(max(unicas))
+    for fila in repetidas:
+        id = generador_ids.siguiente()
+        unicas[id] = (id, *fila[1:])
+
+    return unicas, len(repetidas)
+
+
+def escritor_filas(fp):
+    """Crea un escritor de filas para un archivo CSV de datos"""
+    return csv.writer(
+        fp, delimiter=";", lineterminator="\n", quoting=csv.QUOTE_MINIMAL
+    )
+
+
+class ArchivoReservaciones:
+    """Histórico de reservaciones particionado por año.
+
+    Cada partición guarda las reservaciones cuya fecha de salida cae en ese año en el archivo
+    `reservaciones-AAAA.csv` del directorio. Las particiones se leen solo cuando se necesitan: las que se cargan con
+    :meth:`cargar` quedan en memoria desde ese momento, mientras que :meth:`recorrer` las lee de a una sin guardarlas,
+    para los reportes y búsquedas que abarcan todo el histórico.
+
+    Junto a las particiones se guarda un índice con los clientes de cada una (`clientes.json`), para leer solo las
+    particiones con reservaciones de un cliente.
+
+    Las particiones nuevas se escriben con el formato de compresión `compresion`; las existentes se mantienen en el
+    formato en el que están.
+    """
+
+    def __init__(self, directorio: str, compresion: str = None):
+        self.directorio = directorio
+        self.compresion = compresion
+        # Particiones ya leídas del disco
+        self.particiones: Dict[int, List[Reservacion]] = {}
+        # Filas archivadas en esta sesión que aún no se han escrito
+        self.pendientes: Dict[int, List[tuple]] = {}
+        # Huella del archivo y C.I. de los clientes de cada partición. Se lee del disco la primera vez que se usa
+        self._clientes: Dict[int, Tuple[tuple, Set[str]]] = None
+
+    def ruta(self, anio: int) -> str:
+        """Devuelve la ruta del archivo de la partición"""
+        ruta = os.path.join(self.directorio, "reservaciones-%04d.csv" % anio)
+        return buscar(ruta) or con_codec(ruta, self.compresion)
+
+    def anios(self) -> List[int]:
+        """Devuelve los años que tienen partición, en disco o pendientes"""
+        anios = set(self.pendientes)
+        if os.path.isdir(self.directorio):
+            for nombre in map(sin_codec, os.listdir(self.directorio)):
+                if nombre.startswith("reservaciones-") and nombre.endswith(".csv"):
+                    anios.add(int(nombre[len("reservaciones-") : -len(".csv")]))
+
+        return sorted(anios)
+
+    def archivar(self, fila, clientes: Dict[str, Cliente]):
+        """Mueve una fila al histórico.
+
+        La fila se escribe en su partición al llamar a :meth:`guardar`.
+
+        :return: la reservación construida si la partición ya estaba en memoria, de lo contrario `None`
+        """
+        anio = int(fila[5][:4])
+        self.pendientes.setdefault(anio, []).append(fila)
+
+        if anio not in self.particiones:
+            return None
+
+        reservacion = fila_a_reservacion(fila, clientes)
+        self.particiones[anio].append(reservacion)
+
+        return reservacion
+
+    def _leer(
+        self, anio: int, clientes: Dict[str, Cliente], excluir: Container[int] = ()
+    ) -> List[Reservacion]:
+        """Lee una partición del disco junto con sus filas pendientes, sin guardarla en memoria"""
+        filas = self.pendientes.get(anio, [])
+        ruta = self.ruta(anio)
+        if os.path.exists(ruta):
+            with abrir(ruta) as fp:
+                filas = filas_unicas(itertools.chain(leer_filas(fp), filas))
+        else:
+            filas = filas_unicas(filas)
+
+        return [
+            fila_a_reservacion(fila, clientes)
+            for id, fila in filas.items()
+            if id not in excluir
+        ]
+
+    def cargar(
+        self, anio: int, clientes: Dict[str, Cliente], excluir: Container[int] = ()
+    ) -> List[Reservacion]:
+        """Lee una partición del histórico y la mantiene en memoria.
+
+        :param excluir: IDs de reservaciones que ya están en memoria y tienen prioridad sobre las del histórico
+        :return: las reservaciones leídas. Si la partición ya estaba en memoria, la lista es vacía.
+        """
+        if anio in self.particiones:
+            return []
+
+        reservaciones = self._leer(anio, clientes, excluir)
+        self.particiones[anio] = reservaciones
+
+        return reservaciones
+
+    def _anios_rango(
+        self,
+        fecha_inicial: datetime.datetime = None,
+        fecha_final: datetime.datetime = None,
+    ) -> List[int]:
+        """Devuelve los años de las particiones que pueden tener reservaciones en el rango de fechas.
+
+        Una reservación que termina en el año A pudo haber empezado el año anterior, por eso se incluye la partición
+        siguiente al año de la fecha final. Sin fechas, se devuelven todos los años.
+        """
+        return [
+            anio
+            for anio in self.anios()
+            if (fecha_inicial is None or anio >= fecha_inicial.year)
+            and (fecha_final is None or anio <= fecha_final.year + 1)
+        ]
+
+    def cargar_rango(
+        self,
+        clientes: Dict[str, Cliente],
+        fecha_inicial: datetime.datetime = None,
+        fecha_final: datetime.datetime = None,
+        excluir: Container[int] = (),
+    ) -> List[Reservacion]:
+        """Carga las particiones que pueden tener reservaciones en el rango de fechas (ver :meth:`_anios_rango`).
+
+        :return: las reservaciones leídas que no estaban en memoria
+        """
+        reservaciones = []
+        for anio in self._anios_rango(fecha_inicial, fecha_final):
+            reservaciones.extend(self.cargar(anio, clientes, excluir))
+
+        return reservaciones
+
+    def recorrer(
+        self,
+        clientes: Dict[str, Cliente],
+        fecha_inicial: datetime.datetime = None,
+        fecha_final: datetime.datetime = None,
+        excluir: Container[int] = (),
+        anios: Iterable[int] = None,
+    ) -> Iterator[Reservacion]:
+        """Itera las reservaciones de las particiones del rango de fechas que no están en memoria.
+
+        Las particiones se leen de a una y no se guardan, por lo que solo una partición ocupa memoria a la vez. Las
+        reservaciones de las particiones en memoria se obtienen con :meth:`cargadas`.
+
+        :param anios: años de las particiones a recorrer, en lugar de las del rango de fechas
+        """
+        if anios is None:
+            anios = self._anios_rango(fecha_inicial, fecha_final)
+
+        for anio in anios:
+            if anio not in self.particiones:
+                yield from self._leer(anio, clientes, excluir)
+
+    def anios_cliente(self, ci: str) -> List[int]:
+        """Devuelve los años de las particiones que tienen reservaciones del cliente.
+
+        Las particiones que no están en el índice de clientes, o que cambiaron desde que se indexaron, se leen una vez
+        para actualizarlo.
+        """
+        indice = self._indice_clientes()
+        anios = {anio for anio, (_, cis) in indice.items() if ci in cis}
+        anios.update(
+            anio
+            for anio, filas in self.pendientes.items()
+            if any(fila[1] == ci for fila in filas)
+        )
+
+        return sorted(anios)
+
+    def _ruta_indice_clientes(self) -> str:
+        return os.path.join(self.directorio, "clientes.json")
+
+    def _indice_clientes(self) -> Dict[int, Tuple[tuple, Set[str]]]:
+        """Devuelve el índice de clientes de las particiones en disco, actualizado"""
+        if self._clientes is None:
+            self._clientes = {}
+            try:
+                with open(self._ruta_indice_clientes()) as fp:
+                    for anio, (huella_archivo, cis) in json.load(fp).items():
+                        self._clientes[int(anio)] = (tuple(huella_archivo), set(cis))
+            except (OSError, ValueError):
+                pass
+
+        cambios = False
+        for anio in self.anios():
+            ruta = self.ruta(anio)
+            if not os.path.exists(ruta):
+                continue
+
+            huella_archivo = huella(ruta, calcular_hash=False)
+            if anio in self._clientes and self._clientes[anio][0] == huella_archivo:
+                continue
+
+            with abrir(ruta) as fp:
+                self._clientes[anio] = (huella_archivo, {fila[1] for fila in leer_filas(fp)})
+            cambios = True
+
+        if cambios:
+            self._guardar_indice_clientes()
+
+        return self._clientes
+
+    def _guardar_indice_clientes(self):
+        os.makedirs(self.directorio, exist_ok=True)
+
+        ruta = self._ruta_indice_clientes()
+        temporal = ruta + ".tmp"
+        with open(temporal, "w") as fp:
+            json.dump(
+                {
+                    anio: (huella_archivo, sorted(cis))
+                    for anio, (huella_archivo, cis) in self._clientes.items()
+                },
+                fp,
+            )
+        os.replace(temporal, ruta)
+
+    def cargadas(self) -> Iterable[Reservacion]:
+        """Itera las reservaciones del histórico que están en memoria"""
+        for reservaciones in self.particiones.values():
+            yield from reservaciones
+
+    def guardar(self):
+        """Escribe las filas pendientes en sus particiones"""
+        if len(self.pendientes) == 0:
+            return
+
+        os.makedirs(self.directorio, exist_ok=True)
+        for anio, filas in self.pendientes.items():
+            ruta = self.ruta(anio)
+            # Si el índice de clientes estaba al día con la partición, se actualiza sin volver a leerla
+            indexada = (
+                self._clientes is not None
+                and anio in self._clientes
+                and os.path.exists(ruta)
+                and self._clientes[anio][0] == huella(ruta, calcular_hash=False)
+            )
+
+            with abrir(ruta, "a") as fp:
+                csvwriter = escritor_filas(fp)
+                for fila in filas:
+                    csvwriter.writerow(fila)
+
+            if indexada:
+                cis = self._clientes[anio][1]
+                cis.update(fila[1] for fila in filas)
+                self._clientes[anio] = (huella(ruta, calcular_hash=False), cis)
+
+        if self._clientes is not None:
+            self._guardar_indice_clientes()
+        self.pendientes = {}
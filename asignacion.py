@@ -0,0 +1,133 @@
+import bisect
+import datetime
+from typing import Dict, List, Optional, Tuple
+
+from data import Reservacion
+
+# Holgura que se considera para un lado del hueco que no tiene reservación (el hueco no tiene límite)
+HOLGURA_ABIERTA = 10**6
+
+
+class AsignadorHabitaciones:
+    """Asigna habitaciones eligiendo el hueco libre que mejor se ajusta a la estadía.
+
+    Para cada habitación se mantienen sus ocupaciones ordenadas por fecha de entrada junto con el máximo acumulado de
+    sus fechas de salida, por lo que saber si está libre y cuál es el hueco que la rodea cuesta una búsqueda binaria,
+    aunque una ocupación larga abarque a otras. Entre las habitaciones libres del tipo se elige la que deja menos
+    noches sueltas antes y después de la estadía, para no fragmentar la disponibilidad de estadías largas.
+    """
+
+    def __init__(self, habitaciones: Dict[str, str]):
+        self.por_tipo: Dict[str, List[str]] = {}
+        # Ocupaciones (entrada, salida, ID) de cada habitación, ordenadas por fecha de entrada
+        self._ocupaciones: Dict[str, List[Tuple]] = {}
+        # Para cada posición de `_ocupaciones`, la mayor fecha de salida de las ocupaciones hasta esa posición
+        self._max_salidas: Dict[str, List[datetime.datetime]] = {}
+        self.configurar(habitaciones)
+
+    def configurar(self, habitaciones: Dict[str, str]):
+        """Cambia las habitaciones que se asignan. Las ocupaciones registradas se mantienen"""
+        self.por_tipo = {}
+        for habitacion, tipo in sorted(habitaciones.items()):
+            self.por_tipo.setdefault(tipo, []).append(habitacion)
+            self._ocupaciones.setdefault(habitacion, [])
+            self._max_salidas.setdefault(habitacion, [])
+
+    def ocupar(self, reservacion: Reservacion):
+        """Registra la ocupación de la habitación de la reservación"""
+        ocupaciones = self._ocupaciones.setdefault(reservacion.habitacion, [])
+        ocupacion = (reservacion.fecha_entrada, reservacion.fecha_salida, reservacion.id)
+        i = bisect.bisect_right(ocupaciones, ocupacion)
+        ocupaciones.insert(i, ocupacion)
+        self._actualizar_max(reservacion.habitacion, i)
+
+    def liberar(self, reservacion: Reservacion):
+        """Quita la ocupación de la habitación de la reservación"""
+        ocupaciones = self._ocupaciones.get(reservacion.habitacion, [])
+        ocupacion = (reservacion.fecha_entrada, reservacion.fecha_salida, reservacion.id)
+        i = bisect.bisect_left(ocupaciones, ocupacion)
+        if i < len(ocupaciones) and ocupaciones[i] == ocupacion:
+            del ocupaciones[i]
+            self._actualizar_max(reservacion.habitacion, i)
+
+    def _actualizar_max(self, habitacion: str, desde: int):
+        """Recalcula el máximo acumulado de las fechas de salida a partir de la posición `desde`.
+
+        Las reservaciones nuevas suelen ser las más tardías, por lo que casi siempre se recalcula solo el final.
+        """
+        ocupaciones = self._ocupaciones[habitacion]
+        max_salidas = self._max_salidas.setdefault(habitacion, [])
+        del max_salidas[desde:]
+
+        maximo = max_salidas[-1] if len(max_salidas) > 0 else None
+        for _, salida, _ in ocupaciones[desde:]:
+            if maximo is None or salida > maximo:
+                maximo = salida
+            max_salidas.append(maximo)
+
+    def hueco(
+        self,
+        habitacion: str,
+        fecha_entrada: datetime.datetime,
+        fecha_salida: datetime.datetime,
+    ) -> Optional[Tuple[Optional[datetime.datetime], Optional[datetime.datetime]]]:
+        """Devuelve el hueco libre que contiene a la estadía.
+
+        :return: el par (fin de la ocupación anterior, inicio de la siguiente), donde `None` indica que no hay
+            ocupación de ese lado. Si la habitación está ocupada en el rango, devuelve `None`.
+        """
+        ocupaciones = self._ocupaciones.get(habitacion, [])
+
+        # Las ocupaciones antes de `i` entran antes de que termine la estadía; la que sale más tarde limita el hueco
+        i = bisect.bisect_left(ocupaciones, fecha_salida, key=lambda o: o[0])
+        anterior = self._max_salidas[habitacion][i - 1] if i > 0 else None
+        if anterior is not None and anterior > fecha_entrada:
+            return None
+
+        siguiente = ocupaciones[i][0] if i < len(ocupaciones) else None
+
+        return anterior, siguiente
+
+    def esta_libre(
+        self,
+        habitacion: str,
+        fecha_entrada: datetime.datetime,
+        fecha_salida: datetime.datetime,
+    ) -> bool:
+        """Devuelve si la habitación está libre en el rango de fechas"""
+        return self.hueco(habitacion, fecha_entrada, fecha_salida) is not None
+
+    def asignar(
+        self,
+        tipo: str,
+        fecha_entrada: datetime.datetime,
+        fecha_salida: datetime.datetime,
+    ) -> Optional[str]:
+        """Devuelve la habitación libre del tipo cuyo hueco mejor se ajusta a la estadía.
+
+        La holgura de un hueco son las noches libres que quedarían antes y después de la estadía. Se elige la
+        habitación con menor holgura y, en caso de empate, la de menor número.
+        """
+        mejor = None
+        mejor_holgura = None
+        for habitacion in self.por_tipo.get(tipo, []):
+            hueco = self.hueco(habitacion, fecha_entrada, fecha_salida)
+            if hueco is None:
+                continue
+
+            anterior, siguiente = hueco
+            holgura = (
+                (fecha_entrada - anterior).days
+                if anterior is not None
+                else HOLGURA_ABIERTA
+            ) + (
+                (siguiente - fecha_salida).days
+                if siguiente is not None
+                else HOLGURA_ABIERTA
+            )
+
+            if mejor_holgura is None or holgura < mejor_holgura:
+                mejor = habitacion
+                mejor_holgura = holgura
+
+        return mejor
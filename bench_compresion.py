@@ -0,0 +1,114 @@
+"""Compara el tamaño y el tiempo de carga de los archivos de datos con cada formato de compresión.
+
+Para cada formato se mide la escritura del archivo de reservaciones, la lectura de sus filas (descompresión y CSV,
+que es lo que cambia entre formatos) y la carga completa de la aplicación sin el caché de estado.
+
+Uso: python bench_compresion.py [--reservaciones N] [--repeticiones R]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from app import App
+from archivo import leer_filas
+from compresion import CODECS, abrir, con_codec
+from config import CURRENT_DIR, leer_config
+from sinteticos import escribir, generar_filas
+
+
+def medir(
+    config: dict,
+    directorio: str,
+    codec: str,
+    clientes,
+    reservaciones,
+    repeticiones: int,
+):
+    """Escribe los datos con el formato y mide la escritura, la lectura y la carga (sin el caché de estado).
+
+    De la lectura y la carga se toma el mejor de las repeticiones.
+    """
+    os.makedirs(directorio)
+
+    inicio = time.perf_counter()
+    escribir(con_codec(os.path.join(directorio, "clientes.csv"), codec), clientes)
+    ruta = con_codec(os.path.join(directorio, "reservaciones.csv"), codec)
+    escribir(ruta, reservaciones)
+    escritura = time.perf_counter() - inicio
+
+    lectura = None
+    carga = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        with abrir(ruta) as fp:
+            for _ in leer_filas(fp):
+                pass
+        t = time.perf_counter() - inicio
+        lectura = t if lectura is None else min(lectura, t)
+
+        shutil.rmtree(os.path.join(directorio, ".cache"), ignore_errors=True)
+        app = App.desde_config(config, directorio)
+        # Guardar el caché de estado no depende del formato de los archivos de datos
+        app.cache.guardar = lambda fuentes, estado: None
+
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.cargar()
+        t = time.perf_counter() - inicio
+        carga = t if carga is None else min(carga, t)
+
+    return os.path.getsize(ruta), escritura, lectura, carga
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reservaciones", type=int, default=100_000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(0)
+    config = leer_config(os.path.join(CURRENT_DIR, "seeds", "config.json"))
+    config.pop("compresion", None)
+    clientes, reservaciones = generar_filas(
+        args.reservaciones, list(config["habitaciones"])
+    )
+
+    fmt = "{codec: <8}  {tamanio: >12}  {proporcion: >7}  {escritura: >10}  {lectura: >10}  {carga: >10}"
+    print(
+        fmt.format(
+            codec="Formato",
+            tamanio="Bytes",
+            proporcion="Prop.",
+            escritura="Escritura",
+            lectura="Lectura",
+            carga="Carga",
+        )
+    )
+
+    with tempfile.TemporaryDirectory() as temporal:
+        base = None
+        for codec in [None, *CODECS]:
+            tamanio, escritura, lectura, carga = medir(
+                config,
+                os.path.join(temporal, codec or "csv"),
+                codec,
+                clientes,
+                reservaciones,
+                args.repeticiones,
+            )
+            base = base or tamanio
+            print(
+                fmt.format(
+                    codec=codec or "csv",
+                    tamanio=tamanio,
+                    proporcion="%.1f%%" % (100 * tamanio / base),
+                    escritura="%.2fs" % escritura,
+                    lectura="%.2fs" % lectura,
+                    carga="%.2fs" % carga,
+                )
+            )
@@ -0,0 +1,210 @@
+import heapq
+import itertools
+import re
+import unicodedata
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+_palabra_pattern = re.compile("[a-z0-9]+")
+
+# Largo mínimo de cada término de búsqueda
+MIN_TERMINO = 2
+
+
+def normalizar(texto: str) -> List[str]:
+    """Devuelve las palabras normalizadas de un texto.
+
+    El texto se pasa a minúsculas, se le quitan los acentos y se separa en todo lo que no sea letra o número, por
+    lo que 'José.Pérez@Mail.com' queda como ['jose', 'perez', 'mail', 'com'].
+    """
+    texto = texto.lower()
+    if not texto.isascii():
+        # Separa los acentos de las letras y descarta todo lo que no sea ASCII
+        texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return _palabra_pattern.findall(texto)
+
+
+class IndiceTexto:
+    """Índice invertido sobre uno o más campos de texto de cada documento.
+
+    Cada palabra apunta a los documentos que la contienen, agrupados según dónde aparece la palabra. Un término de
+    búsqueda se resuelve primero contra el vocabulario (las palabras distintas), que es mucho más chico que la
+    cantidad de documentos cuando se indexan nombres, y luego se unen los documentos de las palabras encontradas. Para
+    buscar subcadenas, el vocabulario se mantiene unido en un solo texto en el que se busca con `str.find`.
+
+    Las posiciones y los puntajes son pares (tipo de coincidencia, # del campo), donde menor es mejor. Se prefiere que
+    el campo empiece con el término (0), luego que alguna palabra empiece con el término (1) y por último que alguna
+    palabra lo contenga (2). Entre coincidencias del mismo tipo, se prefieren los primeros campos.
+    """
+
+    def __init__(self):
+        # Texto normalizado de cada documento: las palabras separadas por espacios y los campos por tabulaciones
+        self.documentos: Dict[Hashable, str] = {}
+        # Documentos de cada palabra según su mejor posición en el documento: (palabra, tipo, # del campo)
+        self.claves: Dict[Tuple[str, int, int], Set[Hashable]] = {}
+        # Vocabulario, con la cantidad de entradas de `claves` de cada palabra
+        self.palabras: Dict[str, int] = {}
+        self.campos_count = 0
+        # Palabras del vocabulario separadas por saltos de línea. Se reconstruye al buscar si cambió el vocabulario
+        self._vocabulario: Optional[str] = None
+
+    def __len__(self):
+        return len(self.documentos)
+
+    def __contains__(self, clave: Hashable):
+        return clave in self.documentos
+
+    @staticmethod
+    def _posiciones(texto: str) -> Dict[str, Tuple[int, int]]:
+        """Devuelve la mejor posición de cada palabra del texto normalizado de un documento"""
+        posiciones = {}
+        for i, campo in enumerate(texto.split("\t")):
+            for j, palabra in enumerate(campo.split()):
+                posicion = (0 if j == 0 else 1, i)
+                if palabra not in posiciones or posicion < posiciones[palabra]:
+                    posiciones[palabra] = posicion
+
+        return posiciones
+
+    def agregar(self, clave: Hashable, *campos: str):
+        """Agrega (o reemplaza) el documento con sus campos. Los campos vacíos o `None` no se indexan"""
+        if clave in self.documentos:
+            self.quitar(clave)
+
+        texto = "\t".join(" ".join(normalizar(campo)) if campo else "" for campo in campos)
+        if texto.isspace() or not texto:
+            return
+
+        self.documentos[clave] = texto
+        self.campos_count = max(self.campos_count, len(campos))
+        for palabra, (tipo, campo) in self._posiciones(texto).items():
+            claves = self.claves.get((palabra, tipo, campo))
+            if claves is not None:
+                claves.add(clave)
+                continue
+
+            self.claves[(palabra, tipo, campo)] = {clave}
+            if palabra in self.palabras:
+                self.palabras[palabra] += 1
+            else:
+                self.palabras[palabra] = 1
+                self._vocabulario = None
+
+    def quitar(self, clave: Hashable):
+        """Quita el documento del índice"""
+        texto = self.documentos.pop(clave, None)
+        if texto is None:
+            return
+
+        for palabra, (tipo, campo) in self._posiciones(texto).items():
+            claves = self.claves[(palabra, tipo, campo)]
+            claves.discard(clave)
+            if claves:
+                continue
+
+            del self.claves[(palabra, tipo, campo)]
+            self.palabras[palabra] -= 1
+            if self.palabras[palabra] == 0:
+                del self.palabras[palabra]
+                self._vocabulario = None
+
+    def _palabras(self, termino: str) -> Set[str]:
+        """Devuelve las palabras del vocabulario que contienen al término.
+
+        Los términos de menos de tres caracteres solo se buscan como prefijo de una palabra.
+        """
+        if self._vocabulario is None:
+            self._vocabulario = "\n%s\n" % "\n".join(self.palabras)
+        vocabulario = self._vocabulario
+
+        if len(termino) < 3:
+            termino = "\n" + termino
+
+        palabras = set()
+        i = vocabulario.find(termino)
+        while i >= 0:
+            inicio = vocabulario.rfind("\n", 0, i + 1) + 1
+            fin = vocabulario.find("\n", i + 1)
+            palabras.add(vocabulario[inicio:fin])
+            # La próxima coincidencia se busca a partir de la palabra siguiente
+            i = vocabulario.find(termino, fin)
+
+        return palabras
+
+    def _niveles(self, termino: str) -> List[Tuple[Tuple[int, int], Set[Hashable]]]:
+        """Devuelve los documentos que contienen al término agrupados por puntaje, del mejor al peor.
+
+        Un documento puede aparecer en más de un nivel; su puntaje es el del primero.
+        """
+        niveles: Dict[Tuple[int, int], Set[Hashable]] = {}
+        for palabra in self._palabras(termino):
+            prefijo = palabra.startswith(termino)
+            for tipo, campo in itertools.product((0, 1), range(self.campos_count)):
+                claves = self.claves.get((palabra, tipo, campo))
+                if claves is None:
+                    continue
+
+                puntaje = (tipo if prefijo else 2, campo)
+                if puntaje in niveles:
+                    niveles[puntaje] |= claves
+                else:
+                    niveles[puntaje] = set(claves)
+
+        return sorted(niveles.items(), key=lambda n: n[0])
+
+    def _mas_cortos(self, claves: Set[Hashable], n: int) -> List[Hashable]:
+        """Devuelve los `n` documentos con el texto más corto. Se prefieren porque la coincidencia cubre más del texto"""
+        return [
+            clave
+            for _, clave in heapq.nsmallest(
+                n, ((len(self.documentos[clave]), clave) for clave in claves)
+            )
+        ]
+
+    def buscar(self, consulta: str, limite: int = 20) -> List[Hashable]:
+        """Devuelve las claves de los documentos que contienen todos los términos de la consulta, de la mejor
+        coincidencia a la peor.
+
+        Los términos de menos de :data:`MIN_TERMINO` caracteres se ignoran.
+        """
+        terminos = [t for t in normalizar(consulta) if len(t) >= MIN_TERMINO]
+        if not terminos:
+            return []
+
+        por_termino = [self._niveles(termino) for termino in dict.fromkeys(terminos)]
+
+        if len(por_termino) == 1:
+            # Los niveles ya están ordenados, por lo que basta con recorrerlos hasta completar el límite
+            resultados = []
+            vistos = set()
+            for _, claves in por_termino[0]:
+                claves = claves - vistos
+                vistos |= claves
+                resultados.extend(self._mas_cortos(claves, limite - len(resultados)))
+                if len(resultados) >= limite:
+                    break
+
+            return resultados
+
+        candidatos = None
+        for niveles in por_termino:
+            claves = set().union(*(claves for _, claves in niveles))
+            candidatos = claves if candidatos is None else candidatos & claves
+
+        puntajes = {clave: [] for clave in candidatos}
+        for niveles in por_termino:
+            pendientes = set(candidatos)
+            for puntaje, claves in niveles:
+                for clave in pendientes & claves:
+                    puntajes[clave].append(puntaje)
+                pendientes -= claves
+
+        return [
+            clave
+            for _, _, clave in heapq.nsmallest(
+                limite,
+                (
+                    (sorted(puntaje), len(self.documentos[clave]), clave)
+                    for clave, puntaje in puntajes.items()
+                ),
+            )
+        ]
@@ -0,0 +1,80 @@
+import hashlib
+import os
+import pickle
+from typing import Iterable, List, Optional
+
+# Se incrementa cuando cambia el formato del estado guardado
+VERSION = 1
+
+
+def _hash(ruta: str) -> str:
+    with open(ruta, "rb") as fp:
+        return hashlib.file_digest(fp, "blake2b").hexdigest()
+
+
+def huella(ruta: str, calcular_hash=True):
+    """Devuelve la huella de un archivo: (ruta, tamaño, fecha de modificación, hash)"""
+    stat = os.stat(ruta)
+    return (
+        os.path.abspath(ruta),
+        stat.st_size,
+        stat.st_mtime_ns,
+        _hash(ruta) if calcular_hash else None,
+    )
+
+
+class CacheEstado:
+    """Caché del estado cargado de los archivos de datos.
+
+    Guarda el estado ya construido con `pickle` junto a la huella de los archivos de los que se leyó. El caché es
+    válido mientras los archivos tengan el mismo tamaño y fecha de modificación; si solo cambió la fecha, se compara
+    el hash del contenido.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+
+    def leer(self, fuentes: List[str], claves: Iterable[str] = ()) -> Optional[dict]:
+        """Devuelve el estado guardado si sigue siendo válido para las fuentes, de lo contrario `None`.
+
+        El caché nunca impide la carga: si no se puede leer (por ejemplo, lo guardó una versión del código con otras
+        clases) o no es un diccionario con todas las `claves`, se devuelve `None`.
+        """
+        try:
+            return self._leer(fuentes, claves)
+        except Exception:
+            return None
+
+    def _leer(self, fuentes: List[str], claves: Iterable[str]) -> Optional[dict]:
+        with open(self.ruta, "rb") as fp:
+            version, huellas, estado = pickle.load(fp)
+
+        if version != VERSION or len(huellas) != len(fuentes):
+            return None
+        if not isinstance(estado, dict) or any(clave not in estado for clave in claves):
+            return None
+
+        for fuente, (ruta, tamanio, mtime, hash) in zip(fuentes, huellas):
+            if not os.path.exists(fuente):
+                return None
+
+            stat = os.stat(fuente)
+            if os.path.abspath(fuente) != ruta or stat.st_size != tamanio:
+                return None
+            if stat.st_mtime_ns != mtime and _hash(fuente) != hash:
+                return None
+
+        return estado
+
+    def guardar(self, fuentes: List[str], estado: dict):
+        """Guarda el estado junto a la huella de las fuentes"""
+        os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+
+        temporal = self.ruta + ".tmp"
+        with open(temporal, "wb") as fp:
+            pickle.dump(
+                (VERSION, [huella(fuente) for fuente in fuentes], estado),
+                fp,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temporal, self.ruta)
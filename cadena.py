@@ -0,0 +1,258 @@
+import heapq
+import multiprocessing
+import multiprocessing.connection
+import os
+from typing import Dict, List, Tuple
+
+from app import App
+from config import HOTELES_DIR, leer_config
+from data import MejorCliente, Reservacion
+from ordenamiento import Ordenable, ordenar, shellsort
+from term import print_error
+
+# Operaciones de la aplicación que se pueden pedir a un hotel
+OPERACIONES = (
+    "disponibilidad",
+    "registrar_cliente",
+    "crear_reservacion",
+    "get_reservacion",
+    "abonar",
+    "pagar",
+    "cancelar",
+    "modificar_reservacion",
+    "historial_cliente",
+    "buscar_clientes",
+    "buscar_reservaciones",
+    "reporte_en_periodo",
+    "reporte_cant_reservaciones",
+    "reporte_estadia",
+)
+
+
+def _trabajador(directorio: str, conexion):
+    """Atiende las operaciones de un hotel hasta recibir `None`.
+
+    Cada pedido es una tupla (operación, args, kwargs) y cada respuesta un par (éxito, resultado o excepción). Si el
+    hotel no se puede cargar, el proceso sigue atendiendo y responde a cada pedido con el error de la carga, y al
+    cerrar no persiste nada, para no reemplazar los datos del hotel con una carga incompleta.
+    """
+    ruta = os.path.join(directorio, "config.json")
+    app = None
+    try:
+        cargada = App.desde_config(leer_config(ruta), directorio, ruta)
+        cargada.cargar()
+        app = cargada
+    except Exception as e:
+        error_carga = ValueError(
+            "No se pudo cargar el hotel %s: %s" % (os.path.basename(directorio), e)
+        )
+
+    while True:
+        pedido = conexion.recv()
+        if pedido is None:
+            break
+        if app is None:
+            conexion.send((False, error_carga))
+            continue
+
+        # Si la configuración nueva no es válida se sigue con la anterior, como en el TUI
+        try:
+            app.recargar_config()
+        except ValueError as e:
+            print_error(
+                "No se pudo recargar la configuración de %s: %s"
+                % (os.path.basename(directorio), e)
+            )
+
+        operacion, args, kwargs = pedido
+        try:
+            conexion.send((True, getattr(app, operacion)(*args, **kwargs)))
+        except Exception as e:
+            conexion.send((False, e))
+
+    if app is not None:
+        app.persistir()
+    conexion.send((True, None))
+    conexion.close()
+
+
+def _con_hotel(par):
+    """Itera los pares (hotel, reservación) del reporte de un hotel"""
+    hotel, reporte = par
+    return ((hotel, reservacion) for reservacion in reporte)
+
+
+def hoteles_en(directorio: str = HOTELES_DIR) -> List[str]:
+    """Devuelve los hoteles de la cadena: los subdirectorios que tienen un config.json"""
+    if not os.path.isdir(directorio):
+        return []
+
+    return sorted(
+        nombre
+        for nombre in os.listdir(directorio)
+        if os.path.exists(os.path.join(directorio, nombre, "config.json"))
+    )
+
+
+class Cadena:
+    """Cadena de hoteles.
+
+    Los datos de cada hotel están en su propio directorio dentro de `directorio` y los atiende un proceso propio, que
+    carga sus datos al iniciar. Las operaciones sobre un hotel se envían a su proceso y solo esperan a que ese hotel
+    termine de cargar; los reportes de la cadena se piden a todos los hoteles a la vez y se combinan al final.
+    """
+
+    def __init__(self, directorio: str = HOTELES_DIR):
+        self.directorio = directorio
+        self.procesos: Dict[str, multiprocessing.Process] = {}
+        self.conexiones: Dict[str, multiprocessing.connection.Connection] = {}
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def hoteles(self) -> List[str]:
+        """Devuelve los hoteles iniciados"""
+        return list(self.conexiones)
+
+    def iniciar(self):
+        """Inicia un proceso por cada hotel. No espera a que terminen de cargar"""
+        for hotel in hoteles_en(self.directorio):
+            conexion, conexion_trabajador = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(
+                target=_trabajador,
+                args=(os.path.join(self.directorio, hotel), conexion_trabajador),
+                name="hotel-%s" % hotel,
+                daemon=True,
+            )
+            proceso.start()
+            conexion_trabajador.close()
+
+            self.procesos[hotel] = proceso
+            self.conexiones[hotel] = conexion
+
+    def cerrar(self):
+        """Persiste los datos de cada hotel y termina sus procesos.
+
+        Los procesos que ya terminaron (por ejemplo, por un error) se ignoran.
+        """
+        for conexion in self.conexiones.values():
+            try:
+                conexion.send(None)
+            except OSError:
+                pass
+        for hotel, conexion in self.conexiones.items():
+            try:
+                conexion.recv()
+            except (EOFError, OSError):
+                pass
+            conexion.close()
+            self.procesos[hotel].join()
+
+        self.procesos.clear()
+        self.conexiones.clear()
+
+    def _enviar(self, hotel: str, operacion: str, args, kwargs):
+        if hotel not in self.conexiones:
+            raise ValueError("El hotel %s no existe" % hotel)
+        if operacion not in OPERACIONES:
+            raise ValueError("Operación desconocida: %s" % operacion)
+
+        self.conexiones[hotel].send((operacion, args, kwargs))
+
+    def _recibir(self, hotel: str):
+        exito, resultado = self.conexiones[hotel].recv()
+        if not exito:
+            raise resultado
+
+        return resultado
+
+    def llamar(self, hotel: str, operacion: str, *args, **kwargs):
+        """Ejecuta una operación de :class:`app.App` en el hotel y devuelve su resultado.
+
+        :raises ValueError: si el hotel o la operación no existen, o si la operación falla con ese error
+        """
+        self._enviar(hotel, operacion, args, kwargs)
+        return self._recibir(hotel)
+
+    def en_todos(self, operacion: str, *args, **kwargs) -> Dict[str, object]:
+        """Ejecuta una operación en todos los hoteles a la vez y devuelve el resultado de cada uno.
+
+        Se esperan las respuestas de todos los hoteles antes de informar un error, para que ninguna respuesta quede
+        pendiente en la conexión de su hotel.
+
+        :raises ValueError: si la operación falla en algún hotel, con el error del primero que falló
+        """
+        for hotel in self.conexiones:
+            self._enviar(hotel, operacion, args, kwargs)
+
+        resultados = {}
+        errores = []
+        for hotel in self.conexiones:
+            try:
+                resultados[hotel] = self._recibir(hotel)
+            except Exception as e:
+                errores.append(e)
+        if len(errores) > 0:
+            raise errores[0]
+
+        return resultados
+
+    def disponibilidad(self, hotel: str, *args, **kwargs) -> Dict[str, str]:
+        """Devuelve la disponibilidad del hotel. Ver :meth:`app.App.disponibilidad`"""
+        return self.llamar(hotel, "disponibilidad", *args, **kwargs)
+
+    def crear_reservacion(self, hotel: str, *args, **kwargs) -> Reservacion:
+        """Crea una reservación en el hotel. Ver :meth:`app.App.crear_reservacion`"""
+        return self.llamar(hotel, "crear_reservacion", *args, **kwargs)
+
+    def reporte_en_periodo(
+        self, fecha_inicial, fecha_final, asc=True
+    ) -> List[Tuple[str, Reservacion]]:
+        """Devuelve los pares (hotel, reservación) de la cadena en el rango de fechas ordenados por precio"""
+        reportes = self.en_todos("reporte_en_periodo", fecha_inicial, fecha_final, asc)
+
+        return list(
+            heapq.merge(
+                *map(_con_hotel, reportes.items()),
+                key=lambda par: par[1].precio,
+                reverse=not asc,
+            )
+        )
+
+    def reporte_estadia(self, asc=True) -> List[Tuple[str, Reservacion]]:
+        """Devuelve los pares (hotel, reservación) de la cadena ordenados por duración de estadía"""
+        reportes = self.en_todos("reporte_estadia", asc)
+
+        return list(
+            heapq.merge(
+                *map(_con_hotel, reportes.items()),
+                key=lambda par: par[1].duracion(),
+                reverse=not asc,
+            )
+        )
+
+    def reporte_cant_reservaciones(self, asc=True) -> List[MejorCliente]:
+        """Devuelve los mejores clientes de la cadena.
+
+        Un cliente registrado en varios hoteles suma las reservaciones de todos.
+        """
+        clientes = {}
+        clientes_count = {}
+        for reporte in self.en_todos("reporte_cant_reservaciones", asc).values():
+            for cliente, count in reporte:
+                clientes.setdefault(cliente.ci, cliente)
+                clientes_count[cliente.ci] = clientes_count.get(cliente.ci, 0) + count
+
+        resultados = [
+            Ordenable(ci, count if asc else -count)
+            for ci, count in clientes_count.items()
+        ]
+        ordenar(resultados, respaldo=shellsort)
+
+        return [
+            MejorCliente(clientes[o.data], clientes_count[o.data]) for o in resultados
+        ]
@@ -0,0 +1,153 @@
+import bisect
+import collections
+import datetime
+import json
+import os
+from enum import StrEnum
+from typing import Iterator, List
+
+from exportar import COLUMNAS_RESERVACIONES
+from ids import ContadorIds
+
+# Cantidad de cambios de cada archivo del registro
+CAMBIOS_POR_SEGMENTO = 10_000
+
+# Cantidad de cambios recientes que se mantienen en memoria
+CAPACIDAD = 1024
+
+Cambio = collections.namedtuple(
+    "Cambio", ["secuencia", "tipo", "momento", "reservacion"]
+)
+
+
+class TipoCambio(StrEnum):
+    """Representa el tipo de cambio de una reservación."""
+
+    Creada = "creada"
+    Estado = "estado"
+    Cancelada = "cancelada"
+    Modificada = "modificada"
+
+
+def _segmento(secuencia: int) -> str:
+    """Devuelve el nombre del archivo del registro que empieza con el cambio"""
+    return "cambios-%012d.jsonl" % secuencia
+
+
+def segmentos(directorio: str) -> List[int]:
+    """Devuelve la secuencia del primer cambio de cada archivo del registro, en orden"""
+    if not os.path.isdir(directorio):
+        return []
+
+    return sorted(
+        int(nombre[len("cambios-") : -len(".jsonl")])
+        for nombre in os.listdir(directorio)
+        if nombre.startswith("cambios-") and nombre.endswith(".jsonl")
+    )
+
+
+def leer_cambios(directorio: str, desde: int = 0) -> Iterator[Cambio]:
+    """Itera los cambios del registro en disco posteriores a la secuencia `desde`.
+
+    Solo se leen los archivos del registro a partir del que contiene al cambio siguiente, por lo que el costo depende
+    de los cambios que faltan y no del total. Sirve para consumir los cambios desde otro proceso.
+    """
+    inicios = segmentos(directorio)
+    i = max(0, bisect.bisect_right(inicios, desde + 1) - 1)
+    for inicio in inicios[i:]:
+        with open(os.path.join(directorio, _segmento(inicio))) as fp:
+            for linea in fp:
+                cambio = Cambio(**json.loads(linea))
+                if cambio.secuencia > desde:
+                    yield cambio._replace(tipo=TipoCambio(cambio.tipo))
+
+
+class FeedCambios:
+    """Registro ordenado de los cambios de las reservaciones.
+
+    Cada cambio recibe un número de secuencia y se agrega al registro en disco, dividido en archivos de
+    :data:`CAMBIOS_POR_SEGMENTO` cambios. Las secuencias salen de un :class:`ids.ContadorIds` guardado en el
+    directorio (`secuencia`) y el cambio se escribe sin soltar su candado, por lo que varios procesos que comparten el
+    directorio de datos numeran sus cambios sin repetirse y los escriben en orden.
+
+    Los últimos `capacidad` cambios publicados por este proceso se mantienen también en memoria, por lo que un
+    consumidor al día no lee el disco.
+    """
+
+    def __init__(self, directorio: str, capacidad=CAPACIDAD):
+        self.directorio = directorio
+        # Cambios consecutivos publicados por este proceso. Si otro proceso publica en el medio, se vuelve a empezar
+        self.recientes = collections.deque(maxlen=capacidad)
+        self._contador = ContadorIds(os.path.join(directorio, "secuencia"))
+
+        # Los registros escritos antes de que existiera el contador continúan desde su último cambio
+        inicios = segmentos(directorio)
+        if len(inicios) > 0:
+            ultima = None
+            with open(os.path.join(directorio, _segmento(inicios[-1]))) as fp:
+                for ultima in fp:
+                    pass
+            if ultima is not None:
+                self._contador.observar(json.loads(ultima)["secuencia"])
+
+    def publicar(self, tipo: TipoCambio, fila) -> Cambio:
+        """Registra un cambio de la reservación cuya fila (ver :func:`archivo.reservacion_a_fila`) se indica"""
+        momento = datetime.datetime.now().isoformat(timespec="seconds")
+        reservacion = dict(zip(COLUMNAS_RESERVACIONES, fila))
+        cambios = []
+
+        def escribir(secuencia: int):
+            cambio = Cambio(secuencia, tipo, momento, reservacion)
+            inicio = secuencia - (secuencia - 1) % CAMBIOS_POR_SEGMENTO
+            with open(os.path.join(self.directorio, _segmento(inicio)), "a") as fp:
+                fp.write(json.dumps(cambio._asdict(), ensure_ascii=False) + "\n")
+            cambios.append(cambio)
+
+        self._contador.siguiente_con(escribir)
+        cambio = cambios[0]
+
+        if len(self.recientes) > 0 and self.recientes[-1].secuencia != cambio.secuencia - 1:
+            self.recientes.clear()
+        self.recientes.append(cambio)
+
+        return cambio
+
+    def ultima_secuencia(self) -> int:
+        """Devuelve la secuencia del último cambio publicado por cualquier proceso"""
+        return self._contador.ultimo()
+
+    def seguir(self, desde: int = 0) -> Iterator[Cambio]:
+        """Itera los cambios posteriores a la secuencia `desde`, en orden.
+
+        Los cambios que no están en memoria (los anteriores o los de otros procesos) se leen del disco. La iteración
+        termina con el último cambio publicado; los cambios publicados mientras se itera también se incluyen. Para
+        continuar más tarde, se vuelve a llamar con la secuencia del último cambio recibido.
+        """
+        siguiente = desde + 1
+        ultima = self.ultima_secuencia()
+        while True:
+            if siguiente > ultima:
+                # Se incluyen los cambios publicados mientras se iteraba
+                ultima = self.ultima_secuencia()
+                if siguiente > ultima:
+                    return
+
+            primera = self.recientes[0].secuencia if len(self.recientes) > 0 else None
+            if primera is not None and primera <= siguiente <= self.recientes[-1].secuencia:
+                yield self.recientes[siguiente - primera]
+                siguiente += 1
+                continue
+
+            # Se lee del disco hasta llegar a los cambios en memoria
+            hasta = primera if primera is not None and primera > siguiente else ultima + 1
+            for cambio in leer_cambios(self.directorio, siguiente - 1):
+                if cambio.secuencia >= hasta:
+                    break
+                yield cambio
+                siguiente = cambio.secuencia + 1
+
+            # Si faltan cambios en el disco, se sigue con los que están en memoria o se termina
+            if siguiente < hasta:
+                if hasta > ultima:
+                    return
+                siguiente = hasta
@@ -0,0 +1,54 @@
+import bisect
+from typing import Dict, Tuple
+
+from data import HabitacionTipo
+
+
+class CatalogoHabitaciones:
+    """Catálogo de las habitaciones del hotel, construido una vez a partir de la configuración.
+
+    Guarda el tipo y la capacidad de cada habitación y los tipos del hotel ordenados por capacidad, por lo que los
+    tipos en los que caben N personas son una porción precalculada.
+
+    Si la configuración cambia, se construye un catálogo nuevo (ver :meth:`app.App.recargar_config`).
+    """
+
+    def __init__(self, habitaciones: Dict[str, str]):
+        """
+        :param habitaciones: tipo de cada habitación, como en `config.json`
+        :raises ValueError: si algún tipo de habitación no existe
+        """
+        self.tipo: Dict[str, HabitacionTipo] = {}
+        self.capacidad: Dict[str, int] = {}
+
+        for habitacion, tipo in sorted(habitaciones.items()):
+            try:
+                tipo = HabitacionTipo(tipo)
+            except ValueError:
+                raise ValueError(
+                    "Tipo de habitación desconocido para %s: %s" % (habitacion, tipo)
+                )
+
+            self.tipo[habitacion] = tipo
+            self.capacidad[habitacion] = tipo.capacidad()
+
+        # Los tipos del hotel ordenados por capacidad; con igual capacidad, en el orden de HabitacionTipo
+        presentes = set(self.tipo.values())
+        self.tipos: Tuple[HabitacionTipo, ...] = tuple(
+            sorted(
+                (t for t in HabitacionTipo if t in presentes),
+                key=HabitacionTipo.capacidad,
+            )
+        )
+        self._capacidades_tipos = [t.capacidad() for t in self.tipos]
+
+    def __contains__(self, habitacion: str):
+        return habitacion in self.tipo
+
+    def label(self, tipo: str) -> str:
+        """Devuelve el nombre del tipo de habitación para mostrar"""
+        return HabitacionTipo(tipo).label()
+
+    def tipos_para(self, personas_count: int) -> Tuple[HabitacionTipo, ...]:
+        """Devuelve los tipos del hotel con capacidad para las personas, de menor a mayor capacidad"""
+        return self.tipos[bisect.bisect_left(self._capacidades_tipos, personas_count) :]
@@ -0,0 +1,117 @@
+import bz2
+import gzip
+import lzma
+import os
+from typing import Optional
+
+# Módulo de cada formato de compresión. Todos permiten agregar al final de un archivo comprimido (se agrega un nuevo
+# bloque comprimido que se lee a continuación de los anteriores).
+CODECS = {
+    "gzip": gzip,
+    "lzma": lzma,
+    "bz2": bz2,
+}
+
+EXTENSIONES = {
+    "gzip": ".gz",
+    "lzma": ".xz",
+    "bz2": ".bz2",
+}
+
+# Bytes con los que empieza un archivo de cada formato
+MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "lzma": b"\xfd7zXZ\x00",
+    "bz2": b"BZh",
+}
+
+# Nivel de compresión al escribir. El máximo de gzip y lzma es mucho más lento y casi no reduce los datos
+NIVELES = {
+    "gzip": {"compresslevel": 6},
+    "lzma": {"preset": 6},
+    "bz2": {"compresslevel": 9},
+}
+
+
+def codec_de(ruta: str) -> Optional[str]:
+    """Devuelve el formato de compresión que indica la extensión del archivo o `None`"""
+    for codec, extension in EXTENSIONES.items():
+        if ruta.endswith(extension):
+            return codec
+
+    return None
+
+
+def sin_codec(ruta: str) -> str:
+    """Devuelve la ruta sin la extensión del formato de compresión"""
+    codec = codec_de(ruta)
+    if codec is None:
+        return ruta
+
+    return ruta[: -len(EXTENSIONES[codec])]
+
+
+def detectar(ruta: str) -> Optional[str]:
+    """Devuelve el formato de compresión del archivo según su extensión o, si no la tiene, sus primeros bytes.
+
+    Un archivo sin comprimir devuelve `None`.
+    """
+    codec = codec_de(ruta)
+    if codec is not None:
+        return codec
+
+    with open(ruta, "rb") as fp:
+        inicio = fp.read(max(map(len, MAGIC.values())))
+    for codec, magic in MAGIC.items():
+        if inicio.startswith(magic):
+            return codec
+
+    return None
+
+
+def abrir(ruta: str, modo="r", codec: str = None):
+    """Abre un archivo de texto, comprimido o no.
+
+    El contenido se comprime y descomprime a medida que se escribe y se lee, sin pasar por un archivo intermedio.
+
+    :param modo: 'r', 'w' o 'a'
+    :param codec: formato de compresión. Por defecto, se detecta del archivo existente o de la extensión.
+    """
+    if codec is None:
+        if modo == "w" or not os.path.exists(ruta):
+            codec = codec_de(ruta)
+        else:
+            codec = detectar(ruta)
+
+    if codec is None:
+        return open(ruta, modo)
+
+    return CODECS[codec].open(
+        ruta, modo + "t", **(NIVELES[codec] if modo != "r" else {})
+    )
+
+
+def variantes(ruta: str):
+    """Itera las rutas del archivo sin comprimir y con cada formato de compresión"""
+    yield ruta
+    for extension in EXTENSIONES.values():
+        yield ruta + extension
+
+
+def buscar(ruta: str) -> Optional[str]:
+    """Devuelve la ruta existente del archivo, sin comprimir o con la extensión de algún formato, o `None`"""
+    for variante in variantes(ruta):
+        if os.path.exists(variante):
+            return variante
+
+    return None
+
+
+def con_codec(ruta: str, codec: str = None) -> str:
+    """Devuelve la ruta del archivo con la extensión del formato de compresión"""
+    if codec is None:
+        return ruta
+    if codec not in CODECS:
+        raise ValueError("Formato de compresión desconocido: %s" % codec)
+
+    return ruta + EXTENSIONES[codec]
@@ -3,14 +3,32 @@ import os
 import sys
 
 CURRENT_DIR = os.path.dirname(__file__)
-CONFIG_FILE = os.path.join(CURRENT_DIR, "data", "config.json")
+DATA_DIR = os.path.join(CURRENT_DIR, "data")
+CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
 
+# Cada subdirectorio es el directorio de datos de un hotel de la cadena, con su propio config.json
+HOTELES_DIR = os.path.join(DATA_DIR, "hoteles")
 
-def leer_config():
-    """Lee el archivo de configuración"""
+# Las reservaciones que terminaron hace más de estos días se mueven al histórico
+DIAS_RESIDENTES = 90
 
-    path = CONFIG_FILE
-    if not os.path.exists(path):
-        path = os.path.join(CURRENT_DIR, "seed", "config.json")
-    with open(CONFIG_FILE) as fp:
+
+def ruta_config(path=CONFIG_FILE) -> str:
+    """Devuelve la ruta del archivo de configuración que se lee.
+
+    De no existir el archivo de configuración principal, es la del de muestra.
+    """
+    if path == CONFIG_FILE and not os.path.exists(path):
+        return os.path.join(CURRENT_DIR, "seeds", "config.json")
+
+    return path
+
+
+def leer_config(path=CONFIG_FILE):
+    """Lee el archivo de configuración.
+
+    De no existir el archivo de configuración principal, se usa el de muestra.
+    """
+
+    with open(ruta_config(path)) as fp:
         return json.load(fp)
@@ -13,27 +13,33 @@ class HabitacionTipo(StrEnum):
     Suite = "suite"
 
     def label(self):
-        return {
-            HabitacionTipo.Doble: "Doble",
-            HabitacionTipo.Matrimonial: "Matrimonial",
-            HabitacionTipo.MatrimonialDeluxe: "Matrimonial Deluxe",
-            HabitacionTipo.Triple: "Triple",
-            HabitacionTipo.Suite: "Suite",
-        }[self]
+        return ETIQUETAS_HABITACION[self]
 
     def capacidad(self):
-        return {
-            HabitacionTipo.Doble: 2,
-            HabitacionTipo.Matrimonial: 2,
-            HabitacionTipo.MatrimonialDeluxe: 2,
-            HabitacionTipo.Triple: 3,
-            HabitacionTipo.Suite: 8,
-        }[self]
+        return CAPACIDADES_HABITACION[self]
 
     def __repr__(self):
         return "<%s.%s>" % (self.__class__.__name__, self._name_)
 
 
+# Se construyen una sola vez; los métodos de HabitacionTipo solo las consultan
+ETIQUETAS_HABITACION = {
+    HabitacionTipo.Doble: "Doble",
+    HabitacionTipo.Matrimonial: "Matrimonial",
+    HabitacionTipo.MatrimonialDeluxe: "Matrimonial Deluxe",
+    HabitacionTipo.Triple: "Triple",
+    HabitacionTipo.Suite: "Suite",
+}
+
+CAPACIDADES_HABITACION = {
+    HabitacionTipo.Doble: 2,
+    HabitacionTipo.Matrimonial: 2,
+    HabitacionTipo.MatrimonialDeluxe: 2,
+    HabitacionTipo.Triple: 3,
+    HabitacionTipo.Suite: 8,
+}
+
+
 class ReservacionEstado(StrEnum):
     """Representa el estado de una reservación."""
 
@@ -42,6 +48,22 @@ class ReservacionEstado(StrEnum):
     Pagada = "pagada"
     Cancelada = "cancelada"
 
+    def transiciones(self):
+        """Devuelve los estados a los que puede pasar una reservación en este estado."""
+        return {
+            ReservacionEstado.Pendiente: (
+                ReservacionEstado.Abonada,
+                ReservacionEstado.Pagada,
+                ReservacionEstado.Cancelada,
+            ),
+            ReservacionEstado.Abonada: (
+                ReservacionEstado.Pagada,
+                ReservacionEstado.Cancelada,
+            ),
+            ReservacionEstado.Pagada: (ReservacionEstado.Cancelada,),
+            ReservacionEstado.Cancelada: (),
+        }[self]
+
     def __repr__(self):
         return "<%s.%s>" % (self.__class__.__name__, self._name_)
 
@@ -78,7 +100,8 @@ class Reservacion:
         observaciones=None,
         id=None,
     ):
-        self.id = id or int(datetime.datetime.now().timestamp() * 1000)
+        # El ID lo asigna el generador de IDs de la aplicación
+        self.id = id
         self.cliente = cliente
         self.habitacion = habitacion
         self.estado = estado
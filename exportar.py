@@ -0,0 +1,176 @@
+import argparse
+import csv
+import datetime
+import io
+import json
+from typing import Iterable, Sequence
+
+from archivo import reservacion_a_fila
+from data import MejorCliente, Reservacion
+
+COLUMNAS_RESERVACIONES = (
+    "id",
+    "cliente_ci",
+    "habitacion",
+    "estado",
+    "fecha_entrada",
+    "fecha_salida",
+    "hora_entrada",
+    "hora_salida",
+    "precio",
+    "personas_count",
+    "observaciones",
+)
+
+COLUMNAS_MEJORES_CLIENTES = ("ci", "nombre", "email", "reservaciones_count")
+
+# Tamaño aproximado de cada bloque que se escribe en el archivo
+TAM_BLOQUE = 1 << 20
+
+
+def filas_reservaciones(reservaciones: Iterable[Reservacion]):
+    """Itera las filas de exportación de las reservaciones"""
+    for reservacion in reservaciones:
+        yield reservacion_a_fila(reservacion)
+
+
+def filas_mejores_clientes(mejores_clientes: Iterable[MejorCliente]):
+    """Itera las filas de exportación del reporte de mejores clientes"""
+    for cliente, count in mejores_clientes:
+        yield (cliente.ci, cliente.nombre, cliente.email, count)
+
+
+def exportar_csv(
+    filas: Iterable[Sequence],
+    columnas: Sequence[str],
+    fp,
+    tam_bloque=TAM_BLOQUE,
+) -> int:
+    """Escribe las filas como CSV en bloques de aproximadamente `tam_bloque` caracteres.
+
+    Las filas se consumen a medida que se escriben, por lo que la memoria usada no depende de la cantidad de filas.
+
+    :return: la cantidad de filas escritas
+    """
+    bloque = io.StringIO()
+    csvwriter = csv.writer(bloque, lineterminator="\n")
+    csvwriter.writerow(columnas)
+
+    count = 0
+    for fila in filas:
+        csvwriter.writerow(fila)
+        count += 1
+        if bloque.tell() >= tam_bloque:
+            fp.write(bloque.getvalue())
+            bloque.seek(0)
+            bloque.truncate()
+
+    fp.write(bloque.getvalue())
+
+    return count
+
+
+def exportar_jsonl(
+    filas: Iterable[Sequence],
+    columnas: Sequence[str],
+    fp,
+    tam_bloque=TAM_BLOQUE,
+) -> int:
+    """Escribe las filas como JSON Lines en bloques de aproximadamente `tam_bloque` caracteres.
+
+    Las filas se consumen a medida que se escriben, por lo que la memoria usada no depende de la cantidad de filas.
+
+    :return: la cantidad de filas escritas
+    """
+    bloque = []
+    tam = 0
+
+    count = 0
+    for fila in filas:
+        linea = json.dumps(dict(zip(columnas, fila)), ensure_ascii=False) + "\n"
+        bloque.append(linea)
+        tam += len(linea)
+        count += 1
+        if tam >= tam_bloque:
+            fp.write("".join(bloque))
+            bloque = []
+            tam = 0
+
+    fp.write("".join(bloque))
+
+    return count
+
+
+FORMATOS = {
+    "csv": exportar_csv,
+    "jsonl": exportar_jsonl,
+}
+
+
+def exportar(
+    filas: Iterable[Sequence], columnas: Sequence[str], ruta: str, formato="csv"
+) -> int:
+    """Exporta las filas al archivo en el formato indicado
+
+    :return: la cantidad de filas escritas
+    """
+    with open(ruta, "w", newline="", buffering=TAM_BLOQUE) as fp:
+        return FORMATOS[formato](filas, columnas, fp)
+
+
+def exportar_reporte(app, reporte: str, ruta: str, formato="csv", asc=True, **parametros) -> int:
+    """Exporta uno de los reportes de la aplicación.
+
+    :param reporte: 'periodo' (requiere `fecha_inicial` y `fecha_final`), 'mejores_clientes' o 'estadias'
+    :return: la cantidad de filas escritas
+    """
+    if reporte == "periodo":
+        filas = filas_reservaciones(
+            app.iter_reporte_en_periodo(
+                parametros["fecha_inicial"], parametros["fecha_final"], asc
+            )
+        )
+        columnas = COLUMNAS_RESERVACIONES
+    elif reporte == "mejores_clientes":
+        filas = filas_mejores_clientes(app.iter_reporte_cant_reservaciones(asc))
+        columnas = COLUMNAS_MEJORES_CLIENTES
+    elif reporte == "estadias":
+        filas = filas_reservaciones(app.iter_reporte_estadia(asc))
+        columnas = COLUMNAS_RESERVACIONES
+    else:
+        raise ValueError("Reporte desconocido: %s" % reporte)
+
+    return exportar(filas, columnas, ruta, formato)
+
+
+if __name__ == "__main__":
+    from app import App
+    from config import leer_config
+
+    def fecha(s):
+        return datetime.datetime.strptime(s, "%d/%m/%Y")
+
+    parser = argparse.ArgumentParser(description="Exporta un reporte")
+    parser.add_argument("reporte", choices=["periodo", "mejores_clientes", "estadias"])
+    parser.add_argument("salida", help="ruta del archivo a escribir")
+    parser.add_argument("--formato", choices=list(FORMATOS), default="csv")
+    parser.add_argument("--desc", action="store_true", help="orden descendente")
+    parser.add_argument("--desde", type=fecha, help="fecha inicial (dd/mm/aaaa)")
+    parser.add_argument("--hasta", type=fecha, help="fecha final (dd/mm/aaaa)")
+    args = parser.parse_args()
+
+    if args.reporte == "periodo" and (args.desde is None or args.hasta is None):
+        parser.error("el reporte 'periodo' requiere --desde y --hasta")
+
+    app = App.desde_config(leer_config())
+    app.cargar()
+    count = exportar_reporte(
+        app,
+        args.reporte,
+        args.salida,
+        args.formato,
+        not args.desc,
+        fecha_inicial=args.desde,
+        fecha_final=args.hasta,
+    )
+    print("%d fila(s) exportada(s) a %s" % (count, args.salida))
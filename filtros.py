@@ -0,0 +1,134 @@
+import collections
+import datetime
+import re
+from typing import List
+
+from data import ReservacionEstado
+
+# Campos por los que se puede filtrar y el atributo de la reservación que les corresponde
+CAMPOS = {
+    "estado": "estado",
+    "habitacion": "habitacion",
+    "entrada": "fecha_entrada",
+    "salida": "fecha_salida",
+    "precio": "precio",
+}
+
+# Campos que se comparan por igualdad; el resto admite rangos
+CAMPOS_IGUALDAD = ("estado", "habitacion")
+
+Filtro = collections.namedtuple("Filtro", ["campo", "operador", "valor"])
+
+_patron_filtro = re.compile(r"^([a-z]+)(>=|<=|=|>|<)(.+)$")
+_patron_hoy = re.compile(r"^hoy(?:([+-])(\d+))?$")
+
+AYUDA = """Escriba uno o más filtros separados por espacios. Se muestran las reservaciones que cumplen todos.
+  estado=pendiente         también varios valores: estado=pendiente|abonada
+  habitacion=501           también por prefijo: habitacion=5*
+  entrada>=dd/mm/aaaa      fecha de entrada; admite =, >, >=, <, <=
+  salida<hoy+7             fecha de salida; 'hoy', 'hoy+N' y 'hoy-N' son relativos a hoy
+  precio>500               precio; admite =, >, >=, <, <="""
+
+
+def _leer_fecha(texto: str) -> datetime.datetime:
+    coincidencia = _patron_hoy.match(texto)
+    if coincidencia is None:
+        return datetime.datetime.strptime(texto, "%d/%m/%Y")
+
+    signo, dias = coincidencia.groups()
+    hoy = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    if dias is None:
+        return hoy
+
+    return hoy + datetime.timedelta(days=int(dias) if signo == "+" else -int(dias))
+
+
+def leer_filtro(texto: str) -> List[Filtro]:
+    """Interpreta un texto con filtros separados por espacios (ver :data:`AYUDA`).
+
+    Los valores de igualdad de estado y habitación se convierten en tuplas de alternativas. Los de fechas y precio se
+    convierten a `datetime` y `float`.
+
+    :raises ValueError: si algún filtro no es válido
+    """
+    filtros = []
+    for parte in texto.lower().split():
+        coincidencia = _patron_filtro.match(parte)
+        if coincidencia is None:
+            raise ValueError("Filtro inválido: %s" % parte)
+
+        campo, operador, valor = coincidencia.groups()
+        if campo not in CAMPOS:
+            raise ValueError("Campo desconocido: %s" % campo)
+
+        if campo in CAMPOS_IGUALDAD:
+            if operador != "=":
+                raise ValueError("El campo %s solo admite '='" % campo)
+
+            # Sin repetidos, para que cada reservación se obtenga una sola vez del índice
+            valores = tuple(
+                dict.fromkeys(filter(lambda v: len(v) > 0, valor.split("|")))
+            )
+            if campo == "estado":
+                try:
+                    valores = tuple(map(ReservacionEstado, valores))
+                except ValueError:
+                    raise ValueError("Estado desconocido: %s" % valor)
+            filtros.append(Filtro(campo, operador, valores))
+        elif campo == "precio":
+            try:
+                filtros.append(Filtro(campo, operador, float(valor)))
+            except ValueError:
+                raise ValueError("Precio inválido: %s" % valor)
+        else:
+            try:
+                filtros.append(Filtro(campo, operador, _leer_fecha(valor)))
+            except ValueError:
+                raise ValueError(
+                    "Fecha inválida: %s (formato dd/mm/aaaa o hoy+N)" % valor
+                )
+
+    return filtros
+
+
+def coincide_habitacion(habitacion: str, patron: str) -> bool:
+    """Devuelve si la habitación coincide con el patrón: un nombre o un prefijo terminado en '*'"""
+    if patron.endswith("*"):
+        return habitacion.startswith(patron[:-1])
+
+    return habitacion == patron
+
+
+def cumple(reservacion, filtro: Filtro) -> bool:
+    """Devuelve si la reservación cumple el filtro"""
+    valor = getattr(reservacion, CAMPOS[filtro.campo])
+
+    if filtro.campo == "estado":
+        return valor in filtro.valor
+    if filtro.campo == "habitacion":
+        return any(coincide_habitacion(valor, p) for p in filtro.valor)
+
+    if filtro.operador == "=":
+        return valor == filtro.valor
+    if filtro.operador == ">=":
+        return valor >= filtro.valor
+    if filtro.operador == "<=":
+        return valor <= filtro.valor
+    if filtro.operador == ">":
+        return valor > filtro.valor
+    return valor < filtro.valor
+
+
+def formatear(filtros: List[Filtro]) -> str:
+    """Formatea los filtros con la sintaxis de :func:`leer_filtro`"""
+    partes = []
+    for f in filtros:
+        if f.campo in CAMPOS_IGUALDAD:
+            valor = "|".join(f.valor)
+        elif f.campo == "precio":
+            valor = "%g" % f.valor
+        else:
+            valor = f.valor.strftime("%d/%m/%Y")
+        partes.append(f.campo + f.operador + valor)
+
+    return " ".join(partes)
@@ -0,0 +1,149 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # En sistemas sin fcntl el contador solo es seguro dentro de un proceso
+    fcntl = None
+
+
+class ContadorIds:
+    """Generador de IDs basado en un contador monótono persistido en un archivo.
+
+    El archivo guarda el último ID reservado. Cada proceso reserva bloques de :attr:`bloque` IDs bajo un candado del
+    archivo, por lo que varios procesos que comparten el directorio de datos nunca obtienen el mismo ID. Con bloques
+    de 1 los IDs son consecutivos; con bloques mayores se reduce el acceso al disco a cambio de dejar huecos cuando un
+    proceso termina sin usar todo su bloque.
+    """
+
+    def __init__(self, ruta: str, bloque: int = 1):
+        self.ruta = ruta
+        self.bloque = max(1, bloque)
+        self._proximo = 0
+        self._limite = 0
+        self._lock = threading.Lock()
+
+    def _actualizar(self, funcion):
+        """Aplica `funcion` al valor guardado bajo el candado del archivo y guarda el resultado"""
+        os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+        with open(self.ruta, "a+") as fp:
+            if fcntl is not None:
+                fcntl.flock(fp, fcntl.LOCK_EX)
+            try:
+                fp.seek(0)
+                contenido = fp.read().strip()
+                actual = int(contenido) if contenido else 0
+                nuevo = funcion(actual)
+                if nuevo != actual:
+                    fp.seek(0)
+                    fp.truncate()
+                    fp.write(str(nuevo))
+                    fp.flush()
+                    os.fsync(fp.fileno())
+                return actual, nuevo
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fp, fcntl.LOCK_UN)
+
+    def observar(self, id: int):
+        """Asegura que los próximos IDs sean mayores que `id`"""
+        with self._lock:
+            self._actualizar(lambda actual: max(actual, id))
+            if self._proximo <= id:
+                self._proximo = self._limite = 0
+
+    def siguiente(self) -> int:
+        """Devuelve un ID nuevo"""
+        with self._lock:
+            if self._proximo >= self._limite:
+                actual, nuevo = self._actualizar(lambda actual: actual + self.bloque)
+                self._proximo = actual + 1
+                self._limite = nuevo + 1
+
+            id = self._proximo
+            self._proximo += 1
+
+            return id
+
+    def siguiente_con(self, funcion) -> int:
+        """Reserva el ID siguiente al último reservado y llama a `funcion` con él sin soltar el candado del archivo.
+
+        No usa bloques: sirve para que varios procesos escriban registros numerados en el orden de sus IDs. Si
+        `funcion` falla, el ID no se reserva.
+        """
+        with self._lock:
+
+            def reservar(actual):
+                funcion(actual + 1)
+                return actual + 1
+
+            return self._actualizar(reservar)[1]
+
+    def ultimo(self) -> int:
+        """Devuelve el último ID reservado por cualquier proceso"""
+        with self._lock:
+            return self._actualizar(lambda actual: actual)[0]
+
+
+class SnowflakeIds:
+    """Generador de IDs al estilo Snowflake.
+
+    Cada ID se compone de los milisegundos desde :attr:`EPOCA` (41 bits), el número de nodo (10 bits) y una secuencia
+    dentro del mismo milisegundo (12 bits). No usa el disco, pero cada proceso debe tener un nodo distinto.
+    """
+
+    EPOCA = 1672531200000  # 2023-01-01T00:00:00Z
+    BITS_NODO = 10
+    BITS_SECUENCIA = 12
+
+    def __init__(self, nodo: int):
+        if not 0 <= nodo < (1 << self.BITS_NODO):
+            raise ValueError("El nodo debe estar entre 0 y %d" % ((1 << self.BITS_NODO) - 1))
+
+        self.nodo = nodo
+        self._ultimo_ms = -1
+        self._secuencia = 0
+        self._lock = threading.Lock()
+
+    def observar(self, id: int):
+        """Los IDs dependen del reloj, por lo que no hace falta ajustar nada"""
+
+    def siguiente(self) -> int:
+        """Devuelve un ID nuevo"""
+        with self._lock:
+            ms = int(time.time() * 1000) - self.EPOCA
+            # Si el reloj retrocede, seguimos usando el último milisegundo para no repetir IDs
+            ms = max(ms, self._ultimo_ms)
+
+            if ms == self._ultimo_ms:
+                self._secuencia = (self._secuencia + 1) & ((1 << self.BITS_SECUENCIA) - 1)
+                if self._secuencia == 0:
+                    # Se agotó la secuencia de este milisegundo
+                    ms += 1
+            else:
+                self._secuencia = 0
+
+            self._ultimo_ms = ms
+
+            return (
+                (ms << (self.BITS_NODO + self.BITS_SECUENCIA))
+                | (self.nodo << self.BITS_SECUENCIA)
+                | self._secuencia
+            )
+
+
+def crear_generador_ids(config: dict, directorio: str):
+    """Crea el generador de IDs indicado en la sección `ids` de la configuración.
+
+    :param config: por ejemplo `{"generador": "contador", "bloque": 1}` o `{"generador": "snowflake", "nodo": 3}`
+    :param directorio: directorio de datos donde se guarda el contador
+    """
+    generador = config.get("generador", "contador")
+    if generador == "contador":
+        return ContadorIds(os.path.join(directorio, "ids"), config.get("bloque", 1))
+    if generador == "snowflake":
+        return SnowflakeIds(config.get("nodo", 0))
+
+    raise ValueError("Generador de IDs desconocido: %s" % generador)
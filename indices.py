@@ -0,0 +1,214 @@
+import bisect
+import itertools
+import math
+from typing import Dict, Iterator, List, Set, Tuple
+
+from data import Reservacion, ReservacionEstado
+from filtros import CAMPOS, Filtro, coincide_habitacion, cumple
+from ordenamiento import Ordenable, ordenar
+
+
+class ResumenCliente:
+    """Acumulados de las reservaciones de un cliente."""
+
+    def __init__(self):
+        self.reservaciones_count = 0
+        self.noches = 0
+        self.gasto = 0.0
+
+    def sumar(self, reservacion: Reservacion, signo=1):
+        """Suma (o resta con `signo=-1`) una reservación a los acumulados.
+
+        Las reservaciones canceladas cuentan como reservaciones, pero no suman noches ni gasto.
+        """
+        self.reservaciones_count += signo
+        if reservacion.estado != ReservacionEstado.Cancelada:
+            self.noches += signo * reservacion.duracion()
+            self.gasto += signo * reservacion.precio
+
+
+class IndiceClientes:
+    """Índice de las reservaciones por C.I. del cliente.
+
+    Las reservaciones de cada cliente se mantienen ordenadas por fecha de entrada y sus acumulados se actualizan con
+    cada inserción.
+    """
+
+    def __init__(self):
+        self.reservaciones: Dict[str, List[Reservacion]] = {}
+        self.resumenes: Dict[str, ResumenCliente] = {}
+
+    def agregar(self, reservacion: Reservacion):
+        """Agrega una reservación al índice"""
+        ci = reservacion.cliente.ci
+        if ci not in self.reservaciones:
+            self.reservaciones[ci] = []
+            self.resumenes[ci] = ResumenCliente()
+
+        bisect.insort(
+            self.reservaciones[ci], reservacion, key=lambda r: r.fecha_entrada
+        )
+        self.resumenes[ci].sumar(reservacion)
+
+    def quitar(self, reservacion: Reservacion):
+        """Quita una reservación del índice"""
+        ci = reservacion.cliente.ci
+        reservaciones = self.reservaciones.get(ci, [])
+        for i in range(
+            bisect.bisect_left(
+                reservaciones, reservacion.fecha_entrada, key=lambda r: r.fecha_entrada
+            ),
+            len(reservaciones),
+        ):
+            if reservaciones[i] is reservacion:
+                del reservaciones[i]
+                self.resumenes[ci].sumar(reservacion, -1)
+                return
+
+    def historial(self, ci: str) -> List[Reservacion]:
+        """Devuelve las reservaciones del cliente ordenadas por fecha de entrada"""
+        return self.reservaciones.get(ci, [])
+
+    def resumen(self, ci: str) -> ResumenCliente:
+        """Devuelve los acumulados del cliente"""
+        return self.resumenes.get(ci) or ResumenCliente()
+
+    def cantidades(self):
+        """Itera los pares (C.I., cantidad de reservaciones)"""
+        for ci, resumen in self.resumenes.items():
+            if resumen.reservaciones_count > 0:
+                yield ci, resumen.reservaciones_count
+
+
+class IndiceReservaciones:
+    """Índices de las reservaciones en memoria para filtrarlas (ver :mod:`filtros`).
+
+    El estado y la habitación tienen un índice hash de ID; las fechas y el precio, un arreglo ordenado de pares
+    (valor, ID) en el que se busca con `bisect`. Filtrar cuesta del orden de las reservaciones que cumplen el filtro
+    más selectivo y no del total.
+
+    Los pares nuevos se acumulan y se incorporan a los arreglos ordenados en la siguiente consulta, para que la carga
+    no pague una inserción ordenada por reservación.
+    """
+
+    # Campos con un arreglo ordenado
+    CAMPOS_ORDENADOS = ("entrada", "salida", "precio")
+
+    def __init__(self):
+        self.reservaciones: Dict[int, Reservacion] = {}
+        # Orden en el que se agregó cada reservación por primera vez, para mantenerlo en los resultados
+        self.posiciones: Dict[int, int] = {}
+        self.por_estado: Dict[ReservacionEstado, Set[int]] = {}
+        self.por_habitacion: Dict[str, Set[int]] = {}
+        self.ordenados: Dict[str, List[Tuple[object, int]]] = {
+            campo: [] for campo in self.CAMPOS_ORDENADOS
+        }
+        self.nuevos: Dict[str, List[Tuple[object, int]]] = {
+            campo: [] for campo in self.CAMPOS_ORDENADOS
+        }
+
+    def __len__(self):
+        return len(self.reservaciones)
+
+    def agregar(self, reservacion: Reservacion):
+        """Agrega una reservación al índice"""
+        id = reservacion.id
+        self.reservaciones[id] = reservacion
+        self.posiciones.setdefault(id, len(self.posiciones))
+        self.por_estado.setdefault(reservacion.estado, set()).add(id)
+        self.por_habitacion.setdefault(reservacion.habitacion, set()).add(id)
+        for campo in self.CAMPOS_ORDENADOS:
+            self.nuevos[campo].append((getattr(reservacion, CAMPOS[campo]), id))
+
+    def _ordenado(self, campo: str) -> List[Tuple[object, int]]:
+        """Devuelve el arreglo ordenado del campo, incorporando los pares nuevos"""
+        ordenado = self.ordenados[campo]
+        nuevos = self.nuevos[campo]
+        if len(nuevos) > 0:
+            # Timsort aprovecha las partes ya ordenadas: cuesta poco más que ordenar los pares nuevos y recorrer el arreglo
+            ordenado.extend(nuevos)
+            ordenado.sort()
+            nuevos.clear()
+
+        return ordenado
+
+    def quitar(self, reservacion: Reservacion):
+        """Quita una reservación del índice. Debe llamarse antes de modificar sus campos"""
+        id = reservacion.id
+        if self.reservaciones.pop(id, None) is None:
+            return
+
+        self.por_estado[reservacion.estado].discard(id)
+        self.por_habitacion[reservacion.habitacion].discard(id)
+        for campo in self.CAMPOS_ORDENADOS:
+            ordenado = self._ordenado(campo)
+            par = (getattr(reservacion, CAMPOS[campo]), id)
+            i = bisect.bisect_left(ordenado, par)
+            if i < len(ordenado) and ordenado[i] == par:
+                del ordenado[i]
+
+    def _rango(self, filtro: Filtro) -> Tuple[int, int]:
+        """Devuelve los límites del rango del arreglo ordenado que cumple el filtro"""
+        ordenado = self._ordenado(filtro.campo)
+        # Los IDs son enteros, por lo que (valor, -inf) y (valor, inf) acotan todos los pares con el valor
+        antes = (filtro.valor, -math.inf)
+        despues = (filtro.valor, math.inf)
+
+        if filtro.operador == "=":
+            return bisect.bisect_left(ordenado, antes), bisect.bisect_right(
+                ordenado, despues
+            )
+        if filtro.operador == ">=":
+            return bisect.bisect_left(ordenado, antes), len(ordenado)
+        if filtro.operador == ">":
+            return bisect.bisect_right(ordenado, despues), len(ordenado)
+        if filtro.operador == "<=":
+            return 0, bisect.bisect_right(ordenado, despues)
+        return 0, bisect.bisect_left(ordenado, antes)
+
+    def _conjuntos(self, filtro: Filtro) -> List[Set[int]]:
+        """Devuelve los conjuntos de IDs del índice hash cuya unión cumple el filtro"""
+        if filtro.campo == "estado":
+            return [self.por_estado.get(e, set()) for e in filtro.valor]
+
+        return [
+            ids
+            for habitacion, ids in self.por_habitacion.items()
+            if any(coincide_habitacion(habitacion, p) for p in filtro.valor)
+        ]
+
+    def cantidad(self, filtro: Filtro) -> int:
+        """Devuelve la cantidad de reservaciones que cumplen el filtro, sin recorrerlas"""
+        if filtro.campo in self.CAMPOS_ORDENADOS:
+            inicio, fin = self._rango(filtro)
+            return max(0, fin - inicio)
+
+        return sum(map(len, self._conjuntos(filtro)))
+
+    def candidatos(self, filtro: Filtro) -> Iterator[int]:
+        """Itera los IDs de las reservaciones que cumplen el filtro"""
+        if filtro.campo in self.CAMPOS_ORDENADOS:
+            inicio, fin = self._rango(filtro)
+            return (id for _, id in self._ordenado(filtro.campo)[inicio:fin])
+
+        return itertools.chain.from_iterable(self._conjuntos(filtro))
+
+    def filtrar(self, filtros: List[Filtro]) -> List[Reservacion]:
+        """Devuelve las reservaciones que cumplen todos los filtros, en el orden en que se agregaron.
+
+        Se recorren solo los candidatos del filtro más selectivo, y se descartan los que no cumplen el resto.
+        """
+        if len(filtros) == 0:
+            resultado = list(self.reservaciones.values())
+        else:
+            filtros = sorted(filtros, key=self.cantidad)
+            resultado = [
+                self.reservaciones[id] for id in self.candidatos(filtros[0])
+            ]
+            for filtro in filtros[1:]:
+                resultado = [r for r in resultado if cumple(r, filtro)]
+
+        ordenables = [Ordenable(r, self.posiciones[r.id]) for r in resultado]
+        ordenar(ordenables)
+
+        return [o.data for o in ordenables]
@@ -0,0 +1,116 @@
+import collections
+import functools
+import inspect
+import sys
+from typing import Hashable
+
+import metricas
+
+MAX_ENTRADAS = 32
+MAX_BYTES = 64 << 20
+
+
+def tamanio(valor) -> int:
+    """Estima la memoria propia de un resultado.
+
+    Se cuenta la lista y sus elementos, estimados a partir del primero. Los reportes con el histórico incluyen
+    reservaciones leídas solo para el reporte, por lo que también se cuentan las reservaciones (con sus atributos),
+    aunque algunas sean parte del estado de la aplicación.
+    """
+    total = sys.getsizeof(valor)
+    if isinstance(valor, list) and len(valor) > 0:
+        elemento = valor[0]
+        if hasattr(elemento, "__dict__"):
+            elemento_total = sys.getsizeof(elemento) + sys.getsizeof(vars(elemento))
+        else:
+            elemento_total = sys.getsizeof(elemento)
+        total += len(valor) * elemento_total
+
+    return total
+
+
+class MemoReportes:
+    """Caché LRU de los resultados de los reportes.
+
+    Las claves incluyen la versión de los datos con la que se calculó el resultado, por lo que un cambio en los datos
+    hace que los resultados anteriores no se vuelvan a usar; estos se descartan a medida que se agregan nuevos.
+    Cuando se supera la cantidad de entradas o la memoria estimada, se descartan los menos usados.
+
+    Los resultados se comparten entre llamadas, por lo que no se deben modificar.
+    """
+
+    def __init__(self, max_entradas=MAX_ENTRADAS, max_bytes=MAX_BYTES):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        # Clave -> (resultado, tamaño estimado), de la menos usada a la más usada
+        self.entradas = collections.OrderedDict()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def __contains__(self, clave: Hashable):
+        return clave in self.entradas
+
+    def obtener(self, clave: Hashable):
+        """Devuelve el resultado guardado con la clave y lo marca como el más usado"""
+        self.entradas.move_to_end(clave)
+        return self.entradas[clave][0]
+
+    def guardar(self, clave: Hashable, valor):
+        """Guarda un resultado, descartando los menos usados si hace falta espacio.
+
+        Un resultado más grande que el límite de memoria no se guarda.
+        """
+        t = tamanio(valor)
+        if t > self.max_bytes:
+            return
+
+        if clave in self.entradas:
+            self.bytes -= self.entradas.pop(clave)[1]
+
+        self.entradas[clave] = (valor, t)
+        self.bytes += t
+
+        while len(self.entradas) > self.max_entradas or self.bytes > self.max_bytes:
+            _, (_, t) = self.entradas.popitem(last=False)
+            self.bytes -= t
+            metricas.contar("memo.descartes")
+
+    def limpiar(self):
+        """Descarta todos los resultados"""
+        self.entradas.clear()
+        self.bytes = 0
+
+
+def memoizar(nombre: str = None):
+    """Decorador para los métodos de :class:`app.App` cuyos resultados dependen solo de sus argumentos y de los datos.
+
+    El resultado se guarda en `self.memo` con la clave (nombre, argumentos, `self.version`). Los argumentos se
+    completan con sus valores predeterminados, por lo que `f()` y `f(asc=True)` comparten resultado.
+    """
+
+    def decorador(metodo):
+        etiqueta = nombre or metodo.__qualname__
+        firma = inspect.signature(metodo)
+
+        @functools.wraps(metodo)
+        def memoizado(self, *args, **kwargs):
+            argumentos = firma.bind(self, *args, **kwargs)
+            argumentos.apply_defaults()
+            clave = (etiqueta, tuple(argumentos.arguments.values())[1:])
+
+            if (clave, self.version) in self.memo:
+                metricas.contar("memo.aciertos")
+                return self.memo.obtener((clave, self.version))
+
+            metricas.contar("memo.fallos")
+            resultado = metodo(self, *args, **kwargs)
+            # Se guarda con la versión posterior al cálculo, que puede haber cargado particiones del histórico
+            self.memo.guardar((clave, self.version), resultado)
+
+            return resultado
+
+        return memoizado
+
+    return decorador
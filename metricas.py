@@ -0,0 +1,188 @@
+import functools
+import json
+import math
+import time
+from typing import Dict
+
+# La instrumentación está apagada por defecto. Apagada, cada función medida solo paga una consulta a esta variable.
+activo = False
+
+_contadores: Dict[str, int] = {}
+_latencias: Dict[str, "Histograma"] = {}
+
+
+class Histograma:
+    """Histograma de latencias con cubetas en potencias de 2 (en microsegundos)."""
+
+    def __init__(self):
+        self.cantidad = 0
+        self.total = 0.0
+        self.minimo = math.inf
+        self.maximo = 0.0
+        self.cubetas: Dict[int, int] = {}
+
+    def registrar(self, segundos: float):
+        self.cantidad += 1
+        self.total += segundos
+        self.minimo = min(self.minimo, segundos)
+        self.maximo = max(self.maximo, segundos)
+
+        cubeta = max(0, math.ceil(math.log2(max(segundos * 1e6, 1))))
+        self.cubetas[cubeta] = self.cubetas.get(cubeta, 0) + 1
+
+    def como_dict(self) -> dict:
+        return {
+            "cantidad": self.cantidad,
+            "total_s": self.total,
+            "promedio_s": self.total / self.cantidad if self.cantidad else 0,
+            "minimo_s": self.minimo if self.cantidad else 0,
+            "maximo_s": self.maximo,
+            # Cantidad de llamadas que tardaron hasta `2**n` microsegundos
+            "cubetas_us": {
+                str(2**cubeta): cantidad
+                for cubeta, cantidad in sorted(self.cubetas.items())
+            },
+        }
+
+
+def activar():
+    """Activa la instrumentación"""
+    global activo
+    activo = True
+
+
+def reiniciar():
+    """Descarta las métricas acumuladas"""
+    _contadores.clear()
+    _latencias.clear()
+
+
+def contar(nombre: str, n: int = 1):
+    """Suma `n` al contador"""
+    if activo:
+        _contadores[nombre] = _contadores.get(nombre, 0) + n
+
+
+def registrar_latencia(nombre: str, segundos: float):
+    """Registra la duración de una operación"""
+    if nombre not in _latencias:
+        _latencias[nombre] = Histograma()
+    _latencias[nombre].registrar(segundos)
+
+
+def medir(nombre: str = None):
+    """Decorador que registra la latencia de cada llamada a la función"""
+
+    def decorador(funcion):
+        etiqueta = nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def medida(*args, **kwargs):
+            if not activo:
+                return funcion(*args, **kwargs)
+
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                registrar_latencia(etiqueta, time.perf_counter() - inicio)
+
+        return medida
+
+    return decorador
+
+
+class _ClaveContada:
+    """Clave de ordenamiento que cuenta las comparaciones"""
+
+    __slots__ = ("valor", "contador")
+
+    def __init__(self, valor, contador):
+        self.valor = valor
+        self.contador = contador
+
+    def __lt__(self, otra):
+        self.contador["comparaciones"] += 1
+        return self.valor < otra.valor
+
+    def __le__(self, otra):
+        self.contador["comparaciones"] += 1
+        return self.valor <= otra.valor
+
+    def __gt__(self, otra):
+        self.contador["comparaciones"] += 1
+        return self.valor > otra.valor
+
+    def __ge__(self, otra):
+        self.contador["comparaciones"] += 1
+        return self.valor >= otra.valor
+
+
+class _ArregloContado(list):
+    """Arreglo que cuenta las escrituras. Los subarreglos comparten el contador"""
+
+    def __init__(self, elementos, contador):
+        super().__init__(elementos)
+        self.contador = contador
+
+    def __getitem__(self, i):
+        valor = list.__getitem__(self, i)
+        if isinstance(i, slice):
+            return _ArregloContado(valor, self.contador)
+        return valor
+
+    def __setitem__(self, i, valor):
+        self.contador["escrituras"] += 1
+        list.__setitem__(self, i, valor)
+
+
+def medir_ordenamiento(nombre: str):
+    """Decorador para los algoritmos de ordenamiento.
+
+    Además de la latencia, cuenta los elementos, las comparaciones entre claves y las escrituras en el arreglo (cada
+    intercambio son dos escrituras). Para contar, el arreglo se copia con claves instrumentadas, por lo que la latencia
+    medida incluye ese costo. Las llamadas recursivas no se miden por separado.
+    """
+
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def medida(arr, *args, **kwargs):
+            if not activo or isinstance(arr, _ArregloContado):
+                return funcion(arr, *args, **kwargs)
+
+            contador = {"comparaciones": 0, "escrituras": 0}
+            Par = type(arr[0]) if len(arr) > 0 else tuple
+            instrumentado = _ArregloContado(
+                (Par(o.data, _ClaveContada(o.key, contador)) for o in arr), contador
+            )
+
+            inicio = time.perf_counter()
+            try:
+                return funcion(instrumentado, *args, **kwargs)
+            finally:
+                registrar_latencia(nombre, time.perf_counter() - inicio)
+                arr[:] = [Par(o.data, o.key.valor) for o in instrumentado]
+                contar(nombre + ".elementos", len(arr))
+                contar(nombre + ".comparaciones", contador["comparaciones"])
+                contar(nombre + ".escrituras", contador["escrituras"])
+
+        return medida
+
+    return decorador
+
+
+def resumen() -> dict:
+    """Devuelve las métricas acumuladas"""
+    return {
+        "contadores": dict(sorted(_contadores.items())),
+        "latencias": {
+            nombre: histograma.como_dict()
+            for nombre, histograma in sorted(_latencias.items())
+        },
+    }
+
+
+def volcar(ruta: str):
+    """Guarda las métricas acumuladas como JSON"""
+    with open(ruta, "w") as fp:
+        json.dump(resumen(), fp, indent=2)
@@ -1,10 +1,22 @@
+import datetime
+import enum
+import heapq
+import itertools
+import math
+import pickle
+import struct
+import tempfile
 from collections import namedtuple
-from typing import List
+from typing import Iterable, Iterator, List, Optional
+
+import metricas
+from metricas import medir_ordenamiento
 
 # Representa un par ordenable, donde `data` es el `valor` y key es la clave de ordenamiento
 Ordenable = namedtuple("Ordenable", ["data", "key"])
 
 
+@medir_ordenamiento("quicksort")
 def quicksort(arr: List[Ordenable], lo=0, hi=None):
     """Implementa quicksort recursivamente.
 
@@ -52,6 +64,7 @@ def quicksort_particionar(arr: List[Ordenable], lo, hi):
     return nuevo_pivote_index
 
 
+@medir_ordenamiento("heapsort")
 def heapsort(arr: List[Ordenable]):
     """Implementa heapsort.
 
@@ -99,6 +112,7 @@ def heapsort_max_heapify(heap: List[Ordenable], heap_size, i):
         heapsort_max_heapify(heap, heap_size, mayor_index)
 
 
+@medir_ordenamiento("mergesort")
 def mergesort(arr: List[Ordenable]):
     """Implementa mergesort recursivamente.
 
@@ -122,7 +136,8 @@ def mergesort(arr: List[Ordenable]):
     # Reinsertamos los elementos de cada subarreglo ordenados en el arreglo principal hasta que se acabe uno de los
     # subarreglos
     while cursor_izq < arr_izq_len and cursor_der < arr_der_len:
-        if arr_izq[cursor_izq].key < arr_der[cursor_der].key:
+        # Con `<=` los elementos con claves iguales mantienen su orden relativo
+        if arr_izq[cursor_izq].key <= arr_der[cursor_der].key:
             arr[cursor_principal] = arr_izq[cursor_izq]
             cursor_izq += 1
         else:
@@ -143,6 +158,7 @@ def mergesort(arr: List[Ordenable]):
         cursor_principal += 1
 
 
+@medir_ordenamiento("shellsort")
 def shellsort(arr: List[Ordenable]):
     """Implementa shellsort.
 
@@ -166,3 +182,286 @@ def shellsort(arr: List[Ordenable]):
 
             arr[lo] = temp
         separacion //= 2
+
+
+# Rango de cada miembro de las enumeraciones ya vistas, en el orden en que se comparan
+_RANGOS_ENUM = {}
+
+
+def _rangos_enum(cls):
+    if cls not in _RANGOS_ENUM:
+        try:
+            miembros = sorted(cls)
+        except TypeError:
+            # Las enumeraciones que no se pueden comparar se ordenan por declaración
+            miembros = list(cls)
+        _RANGOS_ENUM[cls] = {m: i for i, m in enumerate(miembros)}
+    return _RANGOS_ENUM[cls]
+
+
+def _codificar_datetime(valor: datetime.datetime) -> int:
+    segundos = valor.hour * 3600 + valor.minute * 60 + valor.second
+    return (valor.toordinal() * 86400 + segundos) * 1000000 + valor.microsecond
+
+
+def _codificar_float(valor: float) -> Optional[int]:
+    if valor.is_integer():
+        return int(valor)
+    return None
+
+
+def codificar_claves(arr: List[Ordenable]) -> Optional[List[int]]:
+    """Codifica las claves del arreglo como enteros que preservan el orden.
+
+    Se pueden codificar enteros, flotantes sin parte decimal, fechas (como ordinales) y miembros de enumeraciones
+    (por su posición al compararlos). Todas las claves deben ser del mismo tipo.
+
+    :return: las claves codificadas o `None` si alguna no se puede codificar
+    """
+    if len(arr) == 0:
+        return []
+
+    tipo = type(arr[0].key)
+    if issubclass(tipo, enum.Enum):
+        rangos = _rangos_enum(tipo)
+        codificar = rangos.__getitem__
+    elif tipo is int or tipo is bool:
+        codificar = int
+    elif tipo is float:
+        codificar = _codificar_float
+    elif tipo is datetime.datetime:
+        codificar = _codificar_datetime
+    elif tipo is datetime.date:
+        codificar = datetime.date.toordinal
+    else:
+        return None
+
+    claves = []
+    for o in arr:
+        if type(o.key) is not tipo:
+            return None
+        clave = codificar(o.key)
+        if clave is None:
+            return None
+        claves.append(clave)
+
+    return claves
+
+
+def _normalizar(claves: List[int]):
+    """Lleva las claves a enteros no negativos lo más pequeños posible.
+
+    Se resta el mínimo y, si el rango es grande, se divide entre el máximo común divisor. Por ejemplo, fechas sin hora
+    codificadas en microsegundos pasan a ser días.
+
+    :return: las claves normalizadas y el rango (la mayor de ellas)
+    """
+    minimo = min(claves)
+    rango = max(claves) - minimo
+    claves = [clave - minimo for clave in claves]
+
+    if not _es_counting_sort(len(claves), rango):
+        divisor = math.gcd(*claves)
+        if divisor > 1:
+            claves = [clave // divisor for clave in claves]
+            rango //= divisor
+
+    return claves, rango
+
+
+def _bits_por_pasada(n: int) -> int:
+    # Usamos dígitos de 16 bits solo cuando hay suficientes elementos para compensar el costo de las cubetas
+    return 16 if n >= 4096 else 8
+
+
+def _es_counting_sort(n: int, rango: int) -> bool:
+    return rango <= max(2 * n, 256)
+
+
+def _pasadas(n: int, rango: int) -> int:
+    if _es_counting_sort(n, rango):
+        return 1
+    return -(-rango.bit_length() // _bits_por_pasada(n))
+
+
+@metricas.medir("radixsort")
+def _radixsort(arr: List[Ordenable], claves: List[int], rango: int):
+    """Radix sort LSD (estable) sobre claves ya normalizadas (ver :func:`_normalizar`).
+
+    Si el rango de las claves es pequeño respecto a la cantidad de elementos, se hace una sola pasada (counting sort).
+    """
+    n = len(arr)
+    metricas.contar("radixsort.elementos", n)
+
+    pares = list(zip(claves, arr))
+
+    if _es_counting_sort(n, rango):
+        # Counting sort: una cubeta por cada valor posible
+        cubetas = [[] for _ in range(rango + 1)]
+        for par in pares:
+            cubetas[par[0]].append(par)
+        arr[:] = [par[1] for cubeta in cubetas for par in cubeta]
+        return
+
+    bits = _bits_por_pasada(n)
+    mascara = (1 << bits) - 1
+    desplazamiento = 0
+    while (rango >> desplazamiento) > 0:
+        cubetas = [[] for _ in range(mascara + 1)]
+        for par in pares:
+            cubetas[(par[0] >> desplazamiento) & mascara].append(par)
+        pares = [par for cubeta in cubetas for par in cubeta]
+        desplazamiento += bits
+        metricas.contar("radixsort.pasadas")
+
+    arr[:] = [par[1] for par in pares]
+
+
+# Con más pasadas que estas, radix sort en Python deja de ganarle a los algoritmos de comparación
+MAX_PASADAS_RADIX = 2
+
+
+def ordenar(arr: List[Ordenable], descendente=False, respaldo=mergesort):
+    """Ordena el arreglo eligiendo el algoritmo según el tipo de las claves.
+
+    Si todas las claves se pueden codificar como enteros y su rango permite ordenarlas en pocas pasadas se usa
+    radix sort; de lo contrario, se usa el algoritmo de respaldo. El orden descendente con el respaldo solo es
+    estable si el respaldo lo es. Se modifica al arreglo para mejor rendimiento.
+
+    :param arr: arreglo a ordenar
+    :param descendente: ordena de mayor a menor
+    :param respaldo: algoritmo de comparación a usar si las claves no son enteras
+    """
+    if len(arr) < 2:
+        return
+
+    claves = codificar_claves(arr)
+    if claves is not None:
+        if descendente:
+            claves = [-clave for clave in claves]
+        claves, rango = _normalizar(claves)
+        if _pasadas(len(arr), rango) <= MAX_PASADAS_RADIX:
+            _radixsort(arr, claves, rango)
+            return
+
+    if descendente:
+        # Invertir antes y después mantiene el orden relativo de las claves iguales
+        arr.reverse()
+        respaldo(arr)
+        arr.reverse()
+    else:
+        respaldo(arr)
+
+
+# Cantidad máxima de elementos que el ordenamiento externo ordena en memoria a la vez
+PRESUPUESTO = 500_000
+
+# Cantidad de elementos de cada bloque de una corrida en disco
+ELEMENTOS_POR_BLOQUE = 4096
+
+# Cantidad máxima de corridas que se mezclan a la vez. Al llegar a esta cantidad, se mezclan en una sola corrida
+MAX_CORRIDAS = 64
+
+_cabecera_bloque = struct.Struct("<I")
+
+
+def _escribir_corrida(corrida: Iterable[Ordenable], directorio: str = None):
+    """Escribe una corrida ordenada en un archivo temporal.
+
+    La corrida se guarda en bloques de :data:`ELEMENTOS_POR_BLOQUE` elementos serializados con `pickle`, cada uno
+    precedido por su largo en bytes. El archivo se borra al cerrarlo.
+    """
+    corrida = iter(corrida)
+    fp = tempfile.TemporaryFile(dir=directorio)
+    while True:
+        bloque = list(itertools.islice(corrida, ELEMENTOS_POR_BLOQUE))
+        if len(bloque) == 0:
+            break
+
+        bloque = pickle.dumps(bloque, protocol=pickle.HIGHEST_PROTOCOL)
+        fp.write(_cabecera_bloque.pack(len(bloque)))
+        fp.write(bloque)
+
+    fp.seek(0)
+    return fp
+
+
+def _leer_corrida(fp) -> Iterator[Ordenable]:
+    """Itera los elementos de una corrida escrita con :func:`_escribir_corrida` y cierra el archivo al terminar"""
+    with fp:
+        while True:
+            cabecera = fp.read(_cabecera_bloque.size)
+            if len(cabecera) == 0:
+                return
+
+            (largo,) = _cabecera_bloque.unpack(cabecera)
+            yield from pickle.loads(fp.read(largo))
+
+
+def _mezclar(archivos) -> Iterator[Ordenable]:
+    """Mezcla las corridas en orden.
+
+    `heapq.merge` es estable: con claves iguales, primero salen los elementos de las primeras corridas.
+    """
+    return heapq.merge(*map(_leer_corrida, archivos), key=lambda o: o.key)
+
+
+def ordenar_externo(
+    elementos: Iterable[Ordenable],
+    presupuesto=PRESUPUESTO,
+    respaldo=mergesort,
+    directorio: str = None,
+) -> Iterator[Ordenable]:
+    """Ordena de forma estable elementos que pueden no caber en memoria y los itera en orden.
+
+    Los elementos se ordenan en corridas de hasta `presupuesto` elementos con :func:`ordenar`. Si hay más de una
+    corrida, cada una se escribe en un archivo temporal y al final se mezclan con un heap, leyendo cada archivo de a
+    un bloque. Si todos los elementos caben en una corrida, no se usa el disco. Los elementos que pasaron por el disco
+    son copias de los originales.
+
+    :param presupuesto: cantidad máxima de elementos en memoria
+    :param respaldo: algoritmo de comparación a usar si las claves no son enteras (ver :func:`ordenar`)
+    :param directorio: directorio de los archivos temporales. Por defecto, el del sistema
+    :raises ValueError: si el presupuesto no es un entero positivo
+    """
+    validar_presupuesto(presupuesto)
+
+    # La validación se hace al llamar a la función y no al empezar a iterar
+    return _ordenar_externo(iter(elementos), presupuesto, respaldo, directorio)
+
+
+def validar_presupuesto(presupuesto):
+    """:raises ValueError: si el presupuesto de :func:`ordenar_externo` no es un entero positivo"""
+    if type(presupuesto) is not int or presupuesto < 1:
+        raise ValueError(
+            "El presupuesto de ordenamiento debe ser un entero positivo: %r" % presupuesto
+        )
+
+
+def _ordenar_externo(elementos, presupuesto, respaldo, directorio):
+    archivos = []
+    try:
+        while True:
+            corrida = list(itertools.islice(elementos, presupuesto))
+            ordenar(corrida, respaldo=respaldo)
+
+            if len(archivos) == 0 and len(corrida) < presupuesto:
+                yield from corrida
+                return
+
+            if len(corrida) > 0:
+                archivos.append(_escribir_corrida(corrida, directorio))
+            if len(archivos) == MAX_CORRIDAS:
+                archivos = [_escribir_corrida(_mezclar(archivos), directorio)]
+            if len(corrida) < presupuesto:
+                break
+
+            # Se libera antes de leer la siguiente corrida
+            del corrida
+
+        metricas.contar("ordenar_externo.corridas", len(archivos))
+
+        yield from _mezclar(archivos)
+    finally:
+        for fp in archivos:
+            fp.close()
@@ -0,0 +1,159 @@
+import datetime
+import functools
+from typing import Dict, List
+
+# Años antes y después del actual que pueden cubrir las tablas de tarifas acumuladas. Las estadías fuera de ese rango
+# (fechas lejanas o mal escritas, como el año 0202) se cotizan noche por noche en lugar de ampliar las tablas
+ANIOS_TABLAS = 10
+
+
+class MotorPrecios:
+    """Calcula el precio de las estadías con tarifas por noche.
+
+    La tarifa de cada noche parte del precio base del tipo de habitación y se ajusta con la sección `tarifas` de la
+    configuración::
+
+        "tarifas": {
+            "dias_semana": {"4": 1.1, "5": 1.1},
+            "temporadas": [
+                {"desde": "12-15", "hasta": "01-06", "factor": 1.25},
+                {"desde": "07-01", "hasta": "08-31", "precios": {"suite": 1100}}
+            ]
+        }
+
+    `dias_semana` indica un factor por día de la semana (0 es lunes). Cada temporada va de `desde` a `hasta`
+    (mes-día, ambos incluidos) y puede cambiar el precio base de algunos tipos (`precios`), aplicar un `factor`, o
+    ambos. Si varias temporadas coinciden se usa la primera.
+
+    Para cada tipo se precalcula la suma acumulada de las tarifas día a día, por lo que cotizar cualquier estadía
+    cuesta una resta. Las cotizaciones recientes además se guardan en un caché LRU. Las tablas no se amplían más allá
+    de :data:`ANIOS_TABLAS` años alrededor del actual.
+    """
+
+    def __init__(
+        self, precios: Dict[str, float], tarifas: dict = None, cache_size=1024
+    ):
+        self.precios = precios
+        self.tarifas = tarifas or {}
+
+        self._dias_semana = {
+            int(dia): factor
+            for dia, factor in self.tarifas.get("dias_semana", {}).items()
+        }
+        self._temporadas = [
+            (
+                _mes_dia(t["desde"]),
+                _mes_dia(t["hasta"]),
+                t.get("precios", {}),
+                t.get("factor", 1),
+            )
+            for t in self.tarifas.get("temporadas", [])
+        ]
+
+        # Las tablas cubren [_origen, _fin] y se amplían cuando se cotiza fuera de ese rango
+        hoy = datetime.date.today()
+        self._origen = self._fin = hoy
+        self._limite_origen = datetime.date(hoy.year - ANIOS_TABLAS, 1, 1)
+        self._limite_fin = datetime.date(hoy.year + ANIOS_TABLAS + 1, 1, 1)
+        self._acumulados: Dict[str, List[float]] = {}
+        self._construir(
+            datetime.date(hoy.year - 1, 1, 1), datetime.date(hoy.year + 3, 1, 1)
+        )
+
+        self._cotizar = functools.lru_cache(maxsize=cache_size)(self._cotizar_sin_cache)
+
+    def tarifa(self, tipo: str, dia: datetime.date) -> float:
+        """Devuelve la tarifa de una noche"""
+        precio = self.precios[tipo]
+        factor = self._dias_semana.get(dia.weekday(), 1)
+
+        md = (dia.month, dia.day)
+        for desde, hasta, precios, factor_temporada in self._temporadas:
+            if desde <= hasta:
+                coincide = desde <= md <= hasta
+            else:
+                # La temporada cruza el fin de año
+                coincide = md >= desde or md <= hasta
+            if coincide:
+                precio = precios.get(tipo, precio)
+                factor *= factor_temporada
+                break
+
+        return precio * factor
+
+    def en_limites(self, entrada, salida) -> bool:
+        """Indica si la estadía está dentro de los años que pueden cubrir las tablas"""
+        return (
+            _fecha(entrada) >= self._limite_origen
+            and _fecha(salida) <= self._limite_fin
+        )
+
+    def _construir(self, desde: datetime.date, hasta: datetime.date):
+        """Construye las tablas de tarifas acumuladas en el rango [desde, hasta)"""
+        dias = (hasta - desde).days
+        self._origen = desde
+        self._fin = hasta
+        self._acumulados = {}
+        for tipo in self.precios:
+            acumulado = 0.0
+            tabla = [acumulado]
+            dia = desde
+            for _ in range(dias):
+                acumulado += self.tarifa(tipo, dia)
+                tabla.append(acumulado)
+                dia += datetime.timedelta(days=1)
+            self._acumulados[tipo] = tabla
+
+    def _asegurar_rango(self, desde: datetime.date, hasta: datetime.date):
+        """Amplía las tablas, de ser necesario, para cubrir el rango [desde, hasta), que debe estar entre los límites"""
+        if desde >= self._origen and hasta <= self._fin:
+            return
+
+        self._construir(
+            datetime.date(min(desde, self._origen).year, 1, 1),
+            min(datetime.date(max(hasta, self._fin).year + 1, 1, 1), self._limite_fin),
+        )
+
+    def _cotizar_sin_cache(
+        self, tipo: str, entrada: datetime.date, salida: datetime.date
+    ) -> float:
+        if not self.en_limites(entrada, salida):
+            # Fuera de los límites de las tablas se suma noche por noche
+            total = 0.0
+            for n in range((salida - entrada).days):
+                total += self.tarifa(tipo, entrada + datetime.timedelta(days=n))
+            return round(total, 2)
+
+        self._asegurar_rango(entrada, salida)
+        tabla = self._acumulados[tipo]
+        i = (entrada - self._origen).days
+        j = (salida - self._origen).days
+
+        return round(tabla[j] - tabla[i], 2)
+
+    def cotizar(
+        self,
+        tipo: str,
+        fecha_entrada: datetime.datetime,
+        fecha_salida: datetime.datetime,
+    ) -> float:
+        """Devuelve el precio de una estadía.
+
+        Se cobran las noches desde la fecha de entrada hasta la noche anterior a la fecha de salida.
+        """
+        if fecha_salida <= fecha_entrada:
+            return 0.0
+
+        return self._cotizar(tipo, _fecha(fecha_entrada), _fecha(fecha_salida))
+
+
+def _mes_dia(s: str):
+    """Convierte un texto 'MM-DD' en la tupla (mes, día)"""
+    mes, dia = s.split("-")
+    return int(mes), int(dia)
+
+
+def _fecha(fecha) -> datetime.date:
+    if isinstance(fecha, datetime.datetime):
+        return fecha.date()
+    return fecha
@@ -1,18 +1,73 @@
+import argparse
+import cProfile
 import os
+import pstats
 import sys
 
 from app import App
-from config import leer_config
+from config import CURRENT_DIR, HOTELES_DIR, leer_config, ruta_config
+import metricas
 
 # Soluciona problemas con importar los otros módulos
 sys.path.append(os.path.join(os.path.dirname(__file__)))
 
+
+def leer_argumentos():
+    parser = argparse.ArgumentParser(description="Sistema de reservas")
+    parser.add_argument(
+        "--profile",
+        metavar="RUTA",
+        nargs="?",
+        const=os.path.join(CURRENT_DIR, "data", "perfil.pstats"),
+        help="ejecuta con cProfile, guarda las estadísticas en RUTA y muestra un resumen al salir",
+    )
+    parser.add_argument(
+        "--metricas",
+        metavar="RUTA",
+        help="activa la instrumentación y guarda las métricas como JSON en RUTA al salir",
+    )
+    parser.add_argument(
+        "--hotel",
+        metavar="ID",
+        help="usa los datos del hotel de la cadena guardados en data/hoteles/ID",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    configs = leer_config()
-    app = App(configs["hotel"]["nombre"], configs["habitaciones"], configs["precios"])
+    args = leer_argumentos()
+
+    metricas_path = args.metricas
+    if args.profile and metricas_path is None:
+        metricas_path = os.path.join(CURRENT_DIR, "data", "metricas.json")
+    if metricas_path is not None:
+        metricas.activar()
+
+    perfil = None
+    if args.profile:
+        perfil = cProfile.Profile()
+        perfil.enable()
+
+    try:
+        if args.hotel is not None:
+            directorio = os.path.join(HOTELES_DIR, args.hotel)
+            ruta = os.path.join(directorio, "config.json")
+            app = App.desde_config(leer_config(ruta), directorio, ruta)
+        else:
+            app = App.desde_config(leer_config(), ruta_config=ruta_config())
+
+        app.cargar()
 
-    app.cargar()
+        app.run()
 
-    app.run()
+        app.persistir()
+    finally:
+        if perfil is not None:
+            perfil.disable()
+            perfil.dump_stats(args.profile)
+            pstats.Stats(perfil, stream=sys.stderr).sort_stats(
+                pstats.SortKey.CUMULATIVE
+            ).print_stats(25)
 
-    app.persistir()
+        if metricas_path is not None:
+            metricas.volcar(metricas_path)
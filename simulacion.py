@@ -0,0 +1,478 @@
+"""Simula sesiones de recepción sobre el TUI y mide la latencia de cada vista.
+
+Cada sesión ejecuta `App.run` con la entrada estándar reemplazada por un guion y la salida capturada, como si alguien
+escribiera en la terminal. Los guiones se generan al azar (reservar, ver reservaciones, reportes, historial,
+búsqueda y gestión de reservaciones) o se leen de un archivo con una línea de entrada por renglón, que se puede
+grabar de una sesión real con `tee guion.txt | python run.py`. Los datos son sintéticos y se crean en un directorio
+temporal.
+
+Al final se muestran los percentiles 50, 95 y 99 de la duración de cada vista, de `persistir` y de la sesión completa.
+
+Uso: python simulacion.py [--sesiones N] [--acciones A] [--reservaciones R] [--habitaciones H] [--persistir-cada P]
+                          [--guion RUTA] [--semilla S]
+"""
+import argparse
+import collections
+import contextlib
+import datetime
+import io
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import unicodedata
+from typing import Dict, Iterator, List
+
+from app import App
+from config import CURRENT_DIR, leer_config
+from data import HabitacionTipo, ReservacionEstado
+from sinteticos import escribir, generar_filas
+
+# Cantidad de escrituras recientes que se guardan de la salida de una sesión
+ESCRITURAS_GUARDADAS = 64
+
+PERCENTILES = (50, 95, 99)
+
+# Una línea de entrada del guion. Se escribe solo si la salida desde la última línea contiene `esperado`; si no, la
+# aplicación tomó otro camino y se descarta el resto del paso. `linea` puede ser una función que recibe esa salida.
+# Ambos textos se comparan en forma normal NFC, ya que algunos textos de la aplicación tienen los acentos separados.
+Entrada = collections.namedtuple("Entrada", ["esperado", "linea"])
+
+
+class Salida(io.TextIOBase):
+    """Salida estándar de una sesión simulada.
+
+    Solo se guardan las últimas escrituras desde la última línea de entrada, que contienen la pregunta que se está
+    respondiendo, y un resumen de lo anterior para diagnosticar sesiones que fallan.
+    """
+
+    def __init__(self):
+        self.recientes = collections.deque(maxlen=ESCRITURAS_GUARDADAS)
+        self.anteriores = collections.deque(maxlen=ESCRITURAS_GUARDADAS)
+
+    def writable(self):
+        return True
+
+    def write(self, s: str) -> int:
+        self.recientes.append(s)
+        return len(s)
+
+    def pregunta(self) -> str:
+        """Devuelve lo escrito desde la última línea de entrada, en forma normal NFC"""
+        return unicodedata.normalize("NFC", "".join(self.recientes))
+
+    def nueva_entrada(self, linea: str):
+        self.anteriores.extend(self.recientes)
+        self.anteriores.append(linea)
+        self.recientes.clear()
+
+    def cola(self) -> str:
+        """Devuelve las últimas escrituras de la sesión, con las líneas de entrada"""
+        return "".join(self.anteriores) + "".join(self.recientes)
+
+
+class EntradaGuionada(io.TextIOBase):
+    """Entrada estándar que escribe las líneas de un guion.
+
+    El guion es una secuencia de pasos, cada uno una lista de :data:`Entrada`. Si la salida no contiene lo esperado
+    por la primera línea de un paso, la sesión quedó desincronizada y se termina la entrada (`input` lanza
+    `EOFError`). Al terminar el guion también se termina la entrada.
+    """
+
+    def __init__(self, pasos: Iterator[List[Entrada]], salida: Salida):
+        self.pasos = iter(pasos)
+        self.salida = salida
+        self.paso: List[Entrada] = []
+        self.desincronizada = False
+
+    def readable(self):
+        return True
+
+    def readline(self, size=-1) -> str:
+        pregunta = self.salida.pregunta()
+        while True:
+            if len(self.paso) == 0:
+                self.paso = list(next(self.pasos, []))
+                if len(self.paso) == 0:
+                    return ""
+                if not self._coincide(self.paso[0], pregunta):
+                    self.desincronizada = True
+                    return ""
+
+            entrada = self.paso.pop(0)
+            if self._coincide(entrada, pregunta):
+                break
+
+            # La aplicación tomó otro camino; se sigue con el próximo paso
+            self.paso = []
+
+        linea = entrada.linea(pregunta) if callable(entrada.linea) else entrada.linea
+        self.salida.nueva_entrada(linea + "\n")
+
+        return linea + "\n"
+
+    @staticmethod
+    def _coincide(entrada: Entrada, pregunta: str) -> bool:
+        return (
+            entrada.esperado is None
+            or unicodedata.normalize("NFC", entrada.esperado) in pregunta
+        )
+
+
+def opcion(etiqueta: str):
+    """Devuelve una función que elige la opción con la etiqueta en la salida de `seleccionar_opcion`"""
+    patron = re.compile(
+        r"\[(\d+)\] " + re.escape(unicodedata.normalize("NFC", etiqueta)) + "\n"
+    )
+
+    def elegir(pregunta: str) -> str:
+        return patron.search(pregunta).group(1)
+
+    return elegir
+
+
+def menu(etiqueta: str) -> Entrada:
+    """Devuelve la línea que elige una opción de un selector"""
+    return Entrada("] %s\n" % etiqueta, opcion(etiqueta))
+
+
+def leer_guion(ruta: str) -> List[List[Entrada]]:
+    """Lee un guion grabado: una línea de entrada por renglón, que se escriben sin verificar la salida"""
+    with open(ruta) as fp:
+        return [[Entrada(None, linea.rstrip("\n")) for linea in fp]]
+
+
+class GeneradorSesiones:
+    """Genera guiones de sesiones de recepción al azar sobre los datos de la aplicación"""
+
+    # Peso de cada acción en una sesión
+    ACCIONES = {
+        "reservar": 40,
+        "listar": 15,
+        "reporte_periodo": 8,
+        "reporte_mejores_clientes": 4,
+        "reporte_estadias": 3,
+        "historial": 12,
+        "buscar": 10,
+        "gestionar": 8,
+    }
+
+    PALABRAS = ("cliente", "correo", "vista", "cuna", "tarde", "1", "25", "com")
+
+    def __init__(self, app: App, rng: random.Random):
+        self.app = app
+        self.rng = rng
+        self.acciones = list(self.ACCIONES)
+        self.pesos = list(self.ACCIONES.values())
+        self.clientes = list(app.clientes)
+        self.siguiente_ci = 1 + max(map(int, self.clientes), default=0)
+        # Las reservaciones de las sesiones empiezan después de las de los datos, para que haya habitaciones libres
+        ultima_salida = max(
+            (r.fecha_salida.date() for r in app.reservaciones),
+            default=datetime.date.today(),
+        )
+        self.primer_dia = max(1, (ultima_salida - datetime.date.today()).days + 1)
+
+    def sesion(self, acciones_count: int) -> Iterator[List[Entrada]]:
+        """Itera los pasos de una sesión con `acciones_count` acciones, que termina saliendo del sistema"""
+        for accion in self.rng.choices(self.acciones, self.pesos, k=acciones_count):
+            yield getattr(self, accion)()
+
+        yield [menu("Salir")]
+
+    def _fecha(self, dias: int) -> str:
+        return (datetime.date.today() + datetime.timedelta(days=dias)).strftime(
+            "%d/%m/%Y"
+        )
+
+    def _ci(self) -> str:
+        return self.rng.choice(self.clientes)
+
+    def reservar(self) -> List[Entrada]:
+        entrada = self.primer_dia + self.rng.randrange(0, 1100)
+        pasos = [
+            menu("Reservar"),
+            Entrada("llegar", self._fecha(entrada)),
+            Entrada("salir", self._fecha(entrada + self.rng.randrange(1, 8))),
+            Entrada("personas", str(self.rng.choice((1, 2, 2, 2, 3, 4)))),
+            Entrada("alguna de estas opciones", "s"),
+            Entrada("tipo de habitación", "1"),
+            Entrada("¿Desa proceder?", "s"),
+        ]
+
+        if self.rng.random() < 0.8:
+            pasos.append(Entrada("C.I.", self._ci()))
+        else:
+            ci = "%08d" % self.siguiente_ci
+            self.siguiente_ci += 1
+            self.clientes.append(ci)
+            pasos += [
+                Entrada("C.I.", ci),
+                Entrada("nombre", "Cliente %s" % ci),
+                Entrada("email", "cliente%s@correo.com" % ci),
+            ]
+
+        pasos.append(
+            Entrada("observación", self.rng.choice(("", "", "", "cuna", "vista al mar")))
+        )
+
+        return pasos
+
+    def listar(self) -> List[Entrada]:
+        pasos = [menu("Ver reservaciones")]
+        if self.rng.random() < 0.7:
+            filtro = self.rng.choice(
+                (
+                    "estado=pendiente entrada>=hoy+7 entrada<hoy+14",
+                    "habitacion=1* precio>500",
+                    "estado=pagada|abonada salida<hoy+30",
+                    "precio>=1500",
+                    "entrada=hoy+%d" % self.rng.randrange(0, 365),
+                )
+            )
+            pasos += [menu("Filtrar"), Entrada("filtro", filtro)]
+        if self.rng.random() < 0.3:
+            pasos += [menu("Ordenar"), Entrada("orden", "-6, 1")]
+
+        return pasos + [menu("Volver al menú")]
+
+    def reporte_periodo(self) -> List[Entrada]:
+        inicio = self.rng.randrange(-30, 300)
+        return [
+            menu("Reporte: reservaciones en período"),
+            Entrada("fecha inicial", self._fecha(inicio)),
+            Entrada("fecha final", self._fecha(inicio + self.rng.randrange(1, 15))),
+            Entrada("descendente", self.rng.choice("sn")),
+            Entrada("<enter>", ""),
+        ]
+
+    def reporte_mejores_clientes(self) -> List[Entrada]:
+        return [
+            menu("Reporte: mejores clientes"),
+            Entrada("descendente", self.rng.choice("sn")),
+            Entrada("<enter>", ""),
+        ]
+
+    def reporte_estadias(self) -> List[Entrada]:
+        return [
+            menu("Reporte: duración de estadías"),
+            Entrada("descendente", self.rng.choice("sn")),
+            Entrada("<enter>", ""),
+        ]
+
+    def historial(self) -> List[Entrada]:
+        return [
+            menu("Historial de cliente"),
+            Entrada("C.I.", self._ci()),
+            Entrada("<enter>", ""),
+        ]
+
+    def buscar(self) -> List[Entrada]:
+        return [
+            menu("Buscar"),
+            menu(
+                self.rng.choice(
+                    ("Clientes (nombre o email)", "Reservaciones (observaciones)")
+                )
+            ),
+            Entrada("texto a buscar", self.rng.choice(self.PALABRAS)),
+            Entrada("<enter>", ""),
+        ]
+
+    def gestionar(self) -> List[Entrada]:
+        pasos = [
+            menu("Gestionar reservación"),
+            Entrada("ID", str(self.rng.randrange(1, 1 + len(self.app.por_id)))),
+        ]
+
+        accion = self.rng.choice(("Abonar", "Pagar", "Cancelar", "Modificar observaciones"))
+        pasos.append(menu(accion))
+        if accion == "Modificar observaciones":
+            pasos.append(Entrada("observaciones", "llega tarde"))
+
+        return pasos
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Devuelve el percentil `p` de los valores ordenados (método del rango más cercano)"""
+    return valores[max(0, math.ceil(p / 100 * len(valores)) - 1)]
+
+
+def config_sintetica(habitaciones_count: int) -> dict:
+    """Devuelve la configuración de un hotel con la cantidad de habitaciones indicada, de todos los tipos"""
+    config = leer_config(os.path.join(CURRENT_DIR, "seeds", "config.json"))
+    config.pop("compresion", None)
+    config["hotel"]["nombre"] = "Hotel simulado"
+
+    tipos = list(HabitacionTipo)
+    config["habitaciones"] = {
+        "%d%02d" % (1 + i // 50, 1 + i % 50): tipos[i % len(tipos)]
+        for i in range(habitaciones_count)
+    }
+
+    return config
+
+
+class Simulacion:
+    """Ejecuta sesiones sobre una aplicación y acumula la duración de cada vista"""
+
+    def __init__(self, app: App):
+        self.app = app
+        self.duraciones: Dict[str, List[float]] = collections.defaultdict(list)
+        self.sesiones_count = 0
+        self.desincronizadas = 0
+        self.errores: List[str] = []
+
+        # Se mide cada vista reemplazando el método de la instancia, que es el que llama `App.run`
+        for nombre in dir(app):
+            if nombre.startswith("vista_"):
+                setattr(app, nombre, self._medir(nombre[len("vista_") :], getattr(app, nombre)))
+
+    def _medir(self, nombre: str, vista):
+        def medida(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return vista(*args, **kwargs)
+            finally:
+                self.duraciones[nombre].append(time.perf_counter() - inicio)
+
+        return medida
+
+    def sesion(self, pasos: Iterator[List[Entrada]]):
+        """Ejecuta `App.run` con la entrada del guion"""
+        salida = Salida()
+        entrada = EntradaGuionada(pasos, salida)
+
+        stdin = sys.stdin
+        sys.stdin = entrada
+        inicio = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(salida):
+                self.app.run()
+        except EOFError:
+            if entrada.desincronizada:
+                self.desincronizadas += 1
+        except Exception as e:
+            self.errores.append("%r\n%s" % (e, salida.cola()[-2000:]))
+        finally:
+            sys.stdin = stdin
+            self.duraciones["sesion"].append(time.perf_counter() - inicio)
+            self.sesiones_count += 1
+
+    def persistir(self):
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.app.persistir()
+        self.duraciones["persistir"].append(time.perf_counter() - inicio)
+
+    def resumen(self) -> Dict[str, dict]:
+        """Devuelve la cantidad de llamadas, los percentiles y el máximo en segundos de cada vista"""
+        resumen = {}
+        for nombre, duraciones in sorted(self.duraciones.items()):
+            duraciones = sorted(duraciones)
+            resumen[nombre] = {
+                "cantidad": len(duraciones),
+                **{"p%d" % p: percentil(duraciones, p) for p in PERCENTILES},
+                "maximo": duraciones[-1],
+            }
+
+        return resumen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sesiones", type=int, default=1000)
+    parser.add_argument("--acciones", type=int, default=5, help="acciones por sesión")
+    parser.add_argument("--reservaciones", type=int, default=20_000)
+    parser.add_argument("--habitaciones", type=int, default=200)
+    parser.add_argument(
+        "--persistir-cada",
+        type=int,
+        default=50,
+        metavar="P",
+        help="persiste los datos cada P sesiones, como al cerrar el sistema (0 para no persistir)",
+    )
+    parser.add_argument(
+        "--guion",
+        metavar="RUTA",
+        help="repite en cada sesión el guion grabado en RUTA en lugar de generarlos",
+    )
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.semilla)
+    rng = random.Random(args.semilla)
+    config = config_sintetica(args.habitaciones)
+    clientes, reservaciones = generar_filas(
+        args.reservaciones, list(config["habitaciones"])
+    )
+
+    with tempfile.TemporaryDirectory() as temporal:
+        escribir(os.path.join(temporal, "clientes.csv"), clientes)
+        escribir(os.path.join(temporal, "reservaciones.csv"), reservaciones)
+
+        app = App.desde_config(config, temporal)
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.cargar()
+        print(
+            "%d reservaciones, %d clientes y %d habitaciones cargados en %.2fs"
+            % (
+                len(reservaciones),
+                len(clientes),
+                len(config["habitaciones"]),
+                time.perf_counter() - inicio,
+            )
+        )
+
+        simulacion = Simulacion(app)
+        generador = GeneradorSesiones(app, rng)
+        guion = leer_guion(args.guion) if args.guion else None
+
+        inicio = time.perf_counter()
+        for i in range(args.sesiones):
+            simulacion.sesion(guion or generador.sesion(args.acciones))
+            if args.persistir_cada > 0 and (i + 1) % args.persistir_cada == 0:
+                simulacion.persistir()
+
+        print(
+            "%d sesiones en %.2fs (%d desincronizadas, %d con errores)"
+            % (
+                simulacion.sesiones_count,
+                time.perf_counter() - inicio,
+                simulacion.desincronizadas,
+                len(simulacion.errores),
+            )
+        )
+        for error in simulacion.errores[:3]:
+            print(error, file=sys.stderr)
+
+        pendientes = sum(r.estado == ReservacionEstado.Pendiente for r in app.reservaciones)
+        print("%d reservaciones al terminar (%d pendientes)" % (len(app.reservaciones), pendientes))
+        print()
+
+        fmt = "{vista: <28}  {cantidad: >8}  {p50: >10}  {p95: >10}  {p99: >10}  {maximo: >10}"
+        print(
+            fmt.format(
+                vista="Vista",
+                cantidad="Llamadas",
+                p50="p50",
+                p95="p95",
+                p99="p99",
+                maximo="Máximo",
+            )
+        )
+        for vista, fila in simulacion.resumen().items():
+            print(
+                fmt.format(
+                    vista=vista,
+                    cantidad=fila["cantidad"],
+                    **{
+                        clave: "%.2fms" % (1000 * fila[clave])
+                        for clave in ("p50", "p95", "p99", "maximo")
+                    },
+                )
+            )
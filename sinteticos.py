@@ -0,0 +1,59 @@
+import datetime
+import random
+from typing import List, Tuple
+
+from archivo import FORMATO_FECHA, escritor_filas
+from compresion import abrir
+
+# Días antes de hoy en los que empiezan las reservaciones generadas. Son menos que los de las reservaciones en memoria
+DIAS_ANTERIORES = 60
+
+
+def generar_filas(
+    reservaciones_count: int, habitaciones: List[str], rng: random.Random = random
+) -> Tuple[List[tuple], List[tuple]]:
+    """Genera las filas de clientes y reservaciones aleatorios con fechas recientes, para que se carguen en memoria.
+
+    Cada habitación tiene su propia línea de tiempo en la que las estadías (de 1 a 14 noches) se encadenan con huecos
+    de hasta una semana, por lo que las reservaciones de una habitación nunca se superponen. Las estadías empiezan
+    :data:`DIAS_ANTERIORES` días antes de hoy y llegan tan lejos como haga falta para la cantidad pedida.
+    """
+    clientes = [
+        ("%08d" % i, "Cliente %d" % i, "cliente%d@correo.com" % i)
+        for i in range(max(1, reservaciones_count // 4))
+    ]
+
+    inicio = datetime.date.today() - datetime.timedelta(days=DIAS_ANTERIORES)
+    libre_desde = {habitacion: inicio for habitacion in habitaciones}
+    reservaciones = []
+    for i in range(reservaciones_count):
+        habitacion = rng.choice(habitaciones)
+        entrada = libre_desde[habitacion] + datetime.timedelta(days=rng.randrange(0, 8))
+        salida = entrada + datetime.timedelta(days=rng.randrange(1, 15))
+        libre_desde[habitacion] = salida
+
+        reservaciones.append(
+            (
+                i + 1,
+                rng.choice(clientes)[0],
+                habitacion,
+                rng.choice(("pendiente", "abonada", "pagada", "cancelada")),
+                entrada.strftime(FORMATO_FECHA),
+                salida.strftime(FORMATO_FECHA),
+                "08:00",
+                "17:00",
+                float(rng.randrange(80, 2000)),
+                rng.randrange(1, 4),
+                "",
+            )
+        )
+
+    return clientes, reservaciones
+
+
+def escribir(ruta: str, filas):
+    """Escribe las filas en un archivo de datos, con la compresión que indique su extensión"""
+    with abrir(ruta, "w") as fp:
+        csvwriter = escritor_filas(fp)
+        for fila in filas:
+            csvwriter.writerow(fila)
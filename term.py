@@ -2,6 +2,7 @@ import datetime
 from typing import List
 
 from data import Cliente, MejorCliente, Reservacion
+import metricas
 import re
 
 
@@ -108,6 +109,7 @@ def seleccionar_opcion(mensaje: str, opciones, valores=[]):
 ### Operaciones específicas
 
 
+@metricas.medir("term.print_tabla_reservaciones")
 def print_tabla_reservaciones(reservaciones: List[Reservacion]):
     """Imprime una tabla con las reservaciones"""
 
@@ -144,6 +146,7 @@ def print_tabla_reservaciones(reservaciones: List[Reservacion]):
     print()
 
 
+@metricas.medir("term.print_tabla_mejores_clientes")
 def print_tabla_mejores_clientes(clientes: List[MejorCliente]):
     """Imprime una tabla con los clientes"""
 
@@ -167,6 +170,17 @@ def print_tabla_mejores_clientes(clientes: List[MejorCliente]):
     print()
 
 
+@metricas.medir("term.print_tabla_clientes")
+def print_tabla_clientes(clientes: List[Cliente]):
+    """Imprime una tabla con los clientes"""
+
+    fmt = "{ci: <8}  {nombre: <24}  {email}"
+    print(fmt.format(ci="C.I.", nombre="Nombre", email="Email"))
+    for cliente in clientes:
+        print(fmt.format(ci=cliente.ci, nombre=cliente.nombre, email=cliente.email))
+    print()
+
+
 def leer_date(mensaje: str):
     """Lee una fecha"""
     while True:
@@ -0,0 +1,110 @@
+from busqueda import IndiceTexto, normalizar
+
+
+def _indice(documentos):
+    indice = IndiceTexto()
+    for clave, campos in documentos.items():
+        indice.agregar(clave, *campos)
+    return indice
+
+
+def test_normalizar():
+    assert normalizar("José.Pérez@Mail.com") == ["jose", "perez", "mail", "com"]
+
+
+def test_inicio_del_campo_luego_inicio_de_palabra_luego_subcadena():
+    indice = _indice(
+        {
+            "subcadena": ("Mariana Lopez",),
+            "palabra": ("Lopez Anabel",),
+            "campo": ("Ana Lopez",),
+        }
+    )
+
+    assert indice.buscar("ana") == ["campo", "palabra", "subcadena"]
+
+
+def test_se_prefieren_los_primeros_campos():
+    indice = _indice(
+        {
+            "email": ("Pedro Perez", "lucia@correo.com"),
+            "nombre": ("Lucia Gomez", "lg@correo.com"),
+        }
+    )
+
+    assert indice.buscar("lucia") == ["nombre", "email"]
+
+
+def test_con_igual_puntaje_se_prefieren_los_textos_cortos():
+    indice = _indice(
+        {
+            "largo": ("vista al mar con balcon y cuna",),
+            "corto": ("vista al mar",),
+        }
+    )
+
+    assert indice.buscar("vista") == ["corto", "largo"]
+
+
+def test_todos_los_terminos_deben_coincidir():
+    indice = _indice(
+        {
+            1: ("Ana Perez", "ana@correo.com"),
+            2: ("Ana Gomez", "agomez@correo.com"),
+            3: ("Juan Perez", "juan@correo.com"),
+        }
+    )
+
+    assert indice.buscar("ana perez") == [1]
+    assert indice.buscar("ana perez juan") == []
+
+
+def test_varios_terminos_se_ordenan_por_sus_puntajes():
+    indice = _indice(
+        {
+            1: ("Mariana Perez",),
+            2: ("Ana Perez Rodriguez",),
+        }
+    )
+
+    # "ana" es inicio del campo en 2 y subcadena en 1; "perez" es inicio de palabra en ambos. El puntaje pesa más
+    # que el largo del texto
+    assert indice.buscar("perez ana") == [2, 1]
+
+
+def test_terminos_cortos():
+    indice = _indice({"ana": ("Ana",), "mariana": ("Mariana",)})
+
+    # Un carácter se ignora; dos caracteres solo coinciden con el inicio de una palabra
+    assert indice.buscar("a") == []
+    assert indice.buscar("an") == ["ana"]
+    assert indice.buscar("ana") == ["ana", "mariana"]
+
+
+def test_acentos_y_mayusculas():
+    indice = _indice({1: ("José Pérez",)})
+
+    assert indice.buscar("JOSE") == [1]
+    assert indice.buscar("pérez") == [1]
+
+
+def test_limite():
+    indice = _indice({i: ("cliente %d" % i,) for i in range(50)})
+
+    assert len(indice.buscar("cliente", limite=7)) == 7
+    assert len(indice.buscar("cliente")) == 20
+
+
+def test_quitar_y_reemplazar_actualizan_el_vocabulario():
+    indice = _indice({1: ("cuna",), 2: ("vista al mar",)})
+    assert indice.buscar("cun") == [1]
+
+    indice.quitar(1)
+    assert indice.buscar("cun") == []
+    assert 1 not in indice
+    assert "cuna" not in indice.palabras
+
+    indice.agregar(2, "llega tarde")
+    assert indice.buscar("vista") == []
+    assert indice.buscar("tard") == [2]
+    assert len(indice) == 1
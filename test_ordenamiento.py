@@ -0,0 +1,200 @@
+import datetime
+import random
+
+import pytest
+
+import ordenamiento
+from data import ReservacionEstado
+from ordenamiento import (
+    Ordenable,
+    heapsort,
+    mergesort,
+    ordenar,
+    ordenar_externo,
+    shellsort,
+)
+
+
+def _ordenables(claves):
+    """Crea los elementos con su posición original como dato, para comprobar la estabilidad"""
+    return [Ordenable(i, clave) for i, clave in enumerate(claves)]
+
+
+def _esperado(arr, descendente=False):
+    """Orden estable de referencia, con `sorted`"""
+    return sorted(arr, key=lambda o: o.key, reverse=descendente)
+
+
+@pytest.fixture
+def radix(monkeypatch):
+    """Cuenta las llamadas a radix sort"""
+    llamadas = []
+    original = ordenamiento._radixsort
+
+    def espia(*args):
+        llamadas.append(len(args[0]))
+        return original(*args)
+
+    monkeypatch.setattr(ordenamiento, "_radixsort", espia)
+    return llamadas
+
+
+def _aleatorias(semilla, generar, n=300):
+    rng = random.Random(semilla)
+    return [generar(rng) for _ in range(n)]
+
+
+CLAVES = {
+    "enteros_pocos_valores": _aleatorias(1, lambda rng: rng.randrange(10)),
+    # Dos pasadas de 8 bits
+    "enteros_dos_pasadas": _aleatorias(2, lambda rng: rng.randrange(-30000, 30000)),
+    "flotantes_enteros": _aleatorias(3, lambda rng: float(rng.randrange(50))),
+    "fechas": _aleatorias(
+        4,
+        lambda rng: datetime.datetime(2024, 1, 1)
+        + datetime.timedelta(days=rng.randrange(60)),
+    ),
+    "enumeraciones": _aleatorias(5, lambda rng: rng.choice(list(ReservacionEstado))),
+}
+
+
+@pytest.mark.parametrize("nombre", list(CLAVES))
+@pytest.mark.parametrize("descendente", [False, True])
+def test_ordenar_claves_enteras_usa_radix_y_es_estable(radix, nombre, descendente):
+    arr = _ordenables(CLAVES[nombre])
+    esperado = _esperado(arr, descendente)
+
+    ordenar(arr, descendente)
+
+    assert arr == esperado
+    assert radix == [len(arr)]
+
+
+@pytest.mark.parametrize("respaldo", [mergesort, heapsort, shellsort])
+def test_ordenar_claves_mixtas_usa_el_respaldo(radix, respaldo):
+    rng = random.Random(6)
+    arr = _ordenables(rng.choice((rng.randrange(20), rng.randrange(20) + 0.5)) for _ in range(200))
+    respaldo_llamado = []
+
+    def espia(a):
+        respaldo_llamado.append(len(a))
+        respaldo(a)
+
+    ordenar(arr, respaldo=espia)
+
+    assert [o.key for o in arr] == sorted(o.key for o in arr)
+    assert respaldo_llamado == [len(arr)]
+    assert radix == []
+
+
+@pytest.mark.parametrize("descendente", [False, True])
+def test_ordenar_textos_con_respaldo_estable(radix, descendente):
+    rng = random.Random(7)
+    arr = _ordenables(rng.choice(("ana", "beto", "carla", "dario")) for _ in range(200))
+    esperado = _esperado(arr, descendente)
+
+    ordenar(arr, descendente, respaldo=mergesort)
+
+    assert arr == esperado
+    assert radix == []
+
+
+def test_ordenar_muchas_pasadas_usa_el_respaldo(radix):
+    # Con pocas claves muy dispersas, radix sort necesitaría más de MAX_PASADAS_RADIX pasadas
+    arr = _ordenables([3**40, 1, 2**50 + 7, 5**21, 11])
+    esperado = _esperado(arr)
+
+    ordenar(arr)
+
+    assert arr == esperado
+    assert radix == []
+
+
+def test_ordenar_arreglos_cortos():
+    vacio = []
+    ordenar(vacio)
+    assert vacio == []
+
+    uno = [Ordenable("a", 1)]
+    ordenar(uno, descendente=True)
+    assert uno == [Ordenable("a", 1)]
+
+
+@pytest.fixture
+def corridas(monkeypatch):
+    """Registra la cantidad de elementos de cada corrida escrita en disco y de archivos de cada mezcla"""
+    registro = {"escritas": [], "mezclas": []}
+    escribir = ordenamiento._escribir_corrida
+    mezclar = ordenamiento._mezclar
+
+    def espia_escribir(corrida, directorio=None):
+        corrida = list(corrida)
+        registro["escritas"].append(len(corrida))
+        return escribir(corrida, directorio)
+
+    def espia_mezclar(archivos):
+        registro["mezclas"].append(len(archivos))
+        return mezclar(archivos)
+
+    monkeypatch.setattr(ordenamiento, "_escribir_corrida", espia_escribir)
+    monkeypatch.setattr(ordenamiento, "_mezclar", espia_mezclar)
+    return registro
+
+
+def test_ordenar_externo_en_memoria(corridas):
+    arr = _ordenables(_aleatorias(8, lambda rng: rng.randrange(100), n=50))
+
+    resultado = list(ordenar_externo(arr, presupuesto=100))
+
+    assert resultado == _esperado(arr)
+    assert corridas == {"escritas": [], "mezclas": []}
+
+
+@pytest.mark.parametrize("respaldo", [mergesort, heapsort])
+def test_ordenar_externo_con_corridas_en_disco(corridas, respaldo):
+    # Claves repetidas entre corridas: la mezcla debe mantener el orden original
+    arr = _ordenables(_aleatorias(9, lambda rng: rng.randrange(20), n=1000))
+
+    resultado = list(ordenar_externo(arr, presupuesto=64, respaldo=respaldo))
+
+    assert resultado == _esperado(arr)
+    assert sum(corridas["escritas"]) == len(arr)
+    assert corridas["mezclas"] == [16]
+
+
+def test_ordenar_externo_claves_de_texto(corridas):
+    arr = _ordenables(_aleatorias(10, lambda rng: rng.choice("abcdefgh") * 3, n=300))
+
+    resultado = list(ordenar_externo(arr, presupuesto=32))
+
+    assert resultado == _esperado(arr)
+    assert len(corridas["escritas"]) == 10
+
+
+def test_ordenar_externo_vuelve_a_mezclar_al_llegar_a_max_corridas(
+    corridas, monkeypatch
+):
+    monkeypatch.setattr(ordenamiento, "MAX_CORRIDAS", 4)
+    arr = _ordenables(_aleatorias(11, lambda rng: rng.randrange(50), n=200))
+
+    resultado = list(ordenar_externo(arr, presupuesto=10))
+
+    assert resultado == _esperado(arr)
+    # Nunca se mezclan más corridas que el máximo a la vez
+    assert max(corridas["mezclas"]) <= 4
+    # Las 20 corridas se reducen mezclando de a 4: una corrida mezclada y 3 nuevas cada vez
+    assert len(corridas["mezclas"]) == 7
+
+
+@pytest.mark.parametrize("presupuesto", [0, -1, 1.5, "100"])
+def test_ordenar_externo_rechaza_presupuestos_invalidos(presupuesto):
+    # Con un presupuesto de 0 no se llenaría ninguna corrida y el ordenamiento no terminaría
+    with pytest.raises(ValueError, match="entero positivo"):
+        ordenar_externo(_ordenables([3, 1, 2]), presupuesto=presupuesto)
+
+
+def test_ordenar_externo_presupuesto_minimo(corridas):
+    arr = _ordenables([3, 1, 2, 1])
+
+    assert list(ordenar_externo(arr, presupuesto=1)) == _esperado(arr)
+    assert corridas["escritas"] == [1, 1, 1, 1]
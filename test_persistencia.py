@@ -0,0 +1,340 @@
+import datetime
+import os
+import pickle
+import shutil
+import sys
+
+import pytest
+
+import cache
+from app import CLAVES_ESTADO, App
+from archivo import escritor_filas, reservacion_a_fila
+from cadena import Cadena
+from config import CURRENT_DIR, leer_config
+
+CONFIG_MUESTRA = os.path.join(CURRENT_DIR, "seeds", "config.json")
+
+CLIENTES = [
+    ("00000001", "Ana Perez", "ana@correo.com"),
+    ("00000002", "Juan Gomez", "juan@correo.com"),
+]
+
+
+def _fecha(dias: int) -> str:
+    return (datetime.date.today() + datetime.timedelta(days=dias)).isoformat()
+
+
+def _fila(id, ci, habitacion, entrada, salida, estado="pendiente", observaciones=""):
+    """Fila del archivo de reservaciones; las fechas son días desde hoy"""
+    return (
+        id,
+        ci,
+        habitacion,
+        estado,
+        _fecha(entrada),
+        _fecha(salida),
+        "10:00",
+        "18:00",
+        100.0,
+        1,
+        observaciones,
+    )
+
+
+def _momento(dias: int) -> datetime.datetime:
+    return datetime.datetime.combine(
+        datetime.date.today() + datetime.timedelta(days=dias), datetime.time()
+    )
+
+
+def _escribir(ruta: str, filas):
+    with open(ruta, "w") as fp:
+        csvwriter = escritor_filas(fp)
+        for fila in filas:
+            csvwriter.writerow(fila)
+
+
+def _leer(ruta: str) -> str:
+    with open(ruta) as fp:
+        return fp.read()
+
+
+def _hotel(directorio: str, reservaciones) -> str:
+    """Crea el directorio de datos de un hotel con la configuración de muestra"""
+    os.makedirs(directorio)
+    shutil.copy(CONFIG_MUESTRA, os.path.join(directorio, "config.json"))
+    _escribir(os.path.join(directorio, "clientes.csv"), CLIENTES)
+    _escribir(os.path.join(directorio, "reservaciones.csv"), reservaciones)
+    return directorio
+
+
+def _app(directorio: str) -> App:
+    """Carga la aplicación de un hotel creado con :func:`_hotel`"""
+    ruta = os.path.join(directorio, "config.json")
+    app = App.desde_config(leer_config(ruta), directorio, ruta)
+    app.cargar()
+    return app
+
+
+def _estado(app: App):
+    """Las reservaciones en memoria como filas, ordenadas por ID"""
+    return sorted(map(reservacion_a_fila, app.reservaciones))
+
+
+def _ids(ruta: str):
+    with open(ruta) as fp:
+        return [int(linea.split(";")[0]) for linea in fp]
+
+
+@pytest.mark.parametrize("caso", ["diario", "persistido_frio", "persistido_caliente"])
+def test_ida_y_vuelta(tmp_path, caso):
+    directorio = _hotel(
+        str(tmp_path / "a"),
+        [_fila(1, "00000001", "101", 10, 12), _fila(2, "00000002", "102", 20, 25)],
+    )
+    app = _app(directorio)
+
+    nueva = app.crear_reservacion(
+        "00000002", "201", _momento(30), _momento(33), observaciones="cuna"
+    )
+    app.abonar(1)
+    app.pagar(1)
+    app.modificar_reservacion(
+        2, habitacion="103", fecha_salida=_momento(27), observaciones="llega tarde"
+    )
+    app.cancelar(nueva.id)
+    esperado = _estado(app)
+
+    reservaciones = os.path.join(directorio, "reservaciones.csv")
+    if caso == "diario":
+        # Los cambios solo se agregaron al final del archivo, por lo que el caché quedó desactualizado
+        assert _ids(reservaciones) == [1, 2, 3, 1, 1, 2, 3]
+        assert app.cache.leer(app._fuentes(), CLAVES_ESTADO) is None
+    else:
+        app.persistir()
+        assert _ids(reservaciones) == [1, 2, 3]
+        assert "cambio" not in _leer(reservaciones)
+        if caso == "persistido_frio":
+            shutil.rmtree(os.path.dirname(app.cache.ruta))
+        else:
+            assert app.cache.leer(app._fuentes(), CLAVES_ESTADO) is not None
+
+    recargada = _app(directorio)
+
+    assert _estado(recargada) == esperado
+    assert recargada.get_reservacion(1).estado == "pagada"
+    assert recargada.get_reservacion(2).habitacion == "103"
+    assert recargada.get_reservacion(nueva.id).estado == "cancelada"
+    # Los IDs no se reutilizan
+    otra = recargada.crear_reservacion("00000001", "104", _momento(40), _momento(41))
+    assert otra.id == nueva.id + 1
+
+
+def test_ids_repetidos_reciben_ids_nuevos(tmp_path):
+    directorio = _hotel(
+        str(tmp_path / "a"),
+        [
+            _fila(1, "00000001", "101", 10, 12),
+            _fila(2, "00000002", "102", 10, 12),
+            # Filas de una versión anterior que repetía IDs: son otras reservaciones
+            _fila(1, "00000002", "103", 20, 22),
+            _fila(2, "00000001", "104", 30, 32),
+            # Una fila de cambio reemplaza a la reservación con su ID
+            (*_fila(1, "00000001", "101", 10, 12, estado="pagada"), "cambio"),
+        ],
+    )
+    reservaciones = os.path.join(directorio, "reservaciones.csv")
+
+    app = _app(directorio)
+    esperado = _estado(app)
+
+    assert [(fila[0], fila[2], fila[3]) for fila in esperado] == [
+        (1, "101", "pagada"),
+        (2, "102", "pendiente"),
+        (3, "103", "pendiente"),
+        (4, "104", "pendiente"),
+    ]
+    # El archivo se reescribe con los IDs nuevos, para que no cambien en las próximas cargas
+    assert _ids(reservaciones) == [1, 2, 3, 4]
+
+    assert _estado(_app(directorio)) == esperado
+    shutil.rmtree(os.path.dirname(app.cache.ruta))
+    assert _estado(_app(directorio)) == esperado
+    assert _ids(reservaciones) == [1, 2, 3, 4]
+
+
+def test_persistir_archiva_las_reservaciones_antiguas(tmp_path):
+    filas = [
+        _fila(1, "00000001", "101", -410, -400),
+        _fila(2, "00000002", "102", -210, -200),
+        _fila(3, "00000001", "103", 10, 12),
+        _fila(4, "00000002", "104", -100, -95),
+    ]
+    directorio = _hotel(str(tmp_path / "a"), filas)
+    reservaciones = os.path.join(directorio, "reservaciones.csv")
+    historico = os.path.join(directorio, "historico")
+    particiones = {}
+    for fila in filas[:2] + filas[3:]:
+        particiones.setdefault(int(fila[5][:4]), []).append(fila[0])
+
+    app = _app(directorio)
+    assert [r.id for r in app.reservaciones] == [3]
+    # Hasta persistir, las reservaciones antiguas siguen en el archivo principal
+    assert _ids(reservaciones) == [1, 2, 3, 4]
+
+    app.persistir()
+
+    assert _ids(reservaciones) == [3]
+    for anio, ids in particiones.items():
+        assert _ids(os.path.join(historico, "reservaciones-%04d.csv" % anio)) == ids
+    assert app.archivo.anios_cliente("00000001") == [int(filas[0][5][:4])]
+
+    for eliminar_cache in (False, True):
+        if eliminar_cache:
+            shutil.rmtree(os.path.dirname(app.cache.ruta))
+        recargada = _app(directorio)
+        assert [r.id for r in recargada.reservaciones] == [3]
+        assert recargada.get_reservacion(1).habitacion == "101"
+        assert sorted(r.id for r in recargada.archivo.recorrer(recargada.clientes)) == [1, 2, 4]
+
+
+def test_reservaciones_archivadas_dos_veces_no_se_duplican(tmp_path):
+    filas = [_fila(1, "00000001", "101", -210, -200), _fila(2, "00000002", "102", 10, 12)]
+    directorio = _hotel(str(tmp_path / "a"), filas)
+    reservaciones = os.path.join(directorio, "reservaciones.csv")
+    _app(directorio).persistir()
+
+    # Como si el programa se hubiera cerrado después de escribir la partición y antes del archivo principal
+    _escribir(reservaciones, filas)
+    shutil.rmtree(os.path.join(directorio, ".cache"))
+    app = _app(directorio)
+    app.persistir()
+
+    particion = os.path.join(
+        directorio, "historico", "reservaciones-%s.csv" % filas[0][5][:4]
+    )
+    assert _ids(particion) == [1, 1]
+    assert _ids(reservaciones) == [2]
+    assert [r.id for r in _app(directorio).archivo.recorrer(app.clientes)] == [1]
+
+
+def test_hotel_que_no_carga_no_se_persiste(tmp_path):
+    _hotel(str(tmp_path / "a"), [_fila(1, "00000001", "101", 10, 12)])
+    # La cuarta reservación es de un cliente desconocido, por lo que la carga falla a mitad del archivo
+    b = _hotel(
+        str(tmp_path / "b"),
+        [
+            _fila(1, "00000001", "101", 10, 12),
+            _fila(2, "00000002", "102", 10, 12),
+            _fila(3, "00000001", "103", 10, 12),
+            _fila(4, "99999999", "104", 10, 12),
+            _fila(5, "00000002", "105", 10, 12),
+        ],
+    )
+    antes = {
+        nombre: _leer(os.path.join(b, nombre))
+        for nombre in ("clientes.csv", "reservaciones.csv")
+    }
+
+    with Cadena(str(tmp_path)) as cadena:
+        assert cadena.hoteles() == ["a", "b"]
+        with pytest.raises(ValueError, match="No se pudo cargar el hotel b"):
+            cadena.llamar("b", "get_reservacion", 1)
+        with pytest.raises(ValueError, match="No se pudo cargar el hotel b"):
+            cadena.en_todos("get_reservacion", 1)
+        assert cadena.llamar("a", "get_reservacion", 1).id == 1
+
+    for nombre, contenido in antes.items():
+        assert _leer(os.path.join(b, nombre)) == contenido
+
+
+def test_crear_reservacion_por_la_cadena_no_reserva_dos_veces(tmp_path):
+    _hotel(str(tmp_path / "a"), [_fila(1, "00000001", "101", 10, 20)])
+    entrada = datetime.datetime.combine(
+        datetime.date.today() + datetime.timedelta(days=30), datetime.time()
+    )
+    salida = entrada + datetime.timedelta(days=3)
+
+    with Cadena(str(tmp_path)) as cadena:
+        # Dos recepciones ven la misma habitación libre y ambas la piden
+        habitacion = cadena.disponibilidad("a", entrada, salida, 2)["doble"]
+        assert cadena.disponibilidad("a", entrada, salida, 2)["doble"] == habitacion
+
+        cadena.crear_reservacion("a", "00000001", habitacion, entrada, salida)
+        with pytest.raises(ValueError, match="está ocupada"):
+            cadena.crear_reservacion("a", "00000002", habitacion, entrada, salida)
+        # Se superpone con la reservación cargada del archivo
+        with pytest.raises(ValueError, match="está ocupada"):
+            cadena.crear_reservacion(
+                "a",
+                "00000002",
+                "101",
+                entrada - datetime.timedelta(days=15),
+                entrada - datetime.timedelta(days=12),
+            )
+
+
+@pytest.mark.parametrize(
+    "config", ['{"habitaciones": ', '{"habitaciones": {"101": "cabaña"}, "precios": {}}']
+)
+def test_configuracion_invalida_mantiene_la_anterior(tmp_path, config):
+    a = _hotel(str(tmp_path / "a"), [_fila(1, "00000001", "101", 10, 12)])
+
+    with Cadena(str(tmp_path)) as cadena:
+        assert cadena.llamar("a", "get_reservacion", 1).id == 1
+
+        ruta = os.path.join(a, "config.json")
+        with open(ruta, "w") as fp:
+            fp.write(config)
+        # Otra fecha de modificación, aunque el archivo se escriba en el mismo instante
+        os.utime(ruta, ns=(0, os.stat(ruta).st_mtime_ns + 10**9))
+
+        assert cadena.llamar("a", "get_reservacion", 1).id == 1
+        # Las habitaciones siguen siendo las de la configuración anterior
+        entrada = datetime.datetime.combine(datetime.date.today(), datetime.time())
+        disponibles = cadena.disponibilidad(
+            "a", entrada + datetime.timedelta(days=30), entrada + datetime.timedelta(days=31)
+        )
+        assert "suite" in disponibles
+
+
+class _ClaseEliminada:
+    """Clase que se quita del módulo después de guardarla en el caché, como si fuera de una versión anterior"""
+
+
+def _reemplazar_cache(app: App, estado):
+    fuentes = app._fuentes()
+    with open(app.cache.ruta, "wb") as fp:
+        pickle.dump(
+            (cache.VERSION, [cache.huella(fuente) for fuente in fuentes], estado), fp
+        )
+
+
+@pytest.mark.parametrize("caso", ["clase_eliminada", "sin_max_id", "no_es_diccionario"])
+def test_cache_invalido_no_impide_la_carga(tmp_path, monkeypatch, caso):
+    directorio = _hotel(str(tmp_path / "a"), [_fila(1, "00000001", "101", 10, 12)])
+    app = _app(directorio)
+    assert os.path.exists(app.cache.ruta)
+
+    if caso == "clase_eliminada":
+        _reemplazar_cache(app, {"clientes": _ClaseEliminada()})
+        monkeypatch.delattr(sys.modules[__name__], "_ClaseEliminada")
+    elif caso == "sin_max_id":
+        _reemplazar_cache(app, {"clientes": {}, "reservaciones": [], "pendientes": {}})
+    else:
+        _reemplazar_cache(app, [])
+
+    app = _app(directorio)
+
+    assert list(app.clientes) == ["00000001", "00000002"]
+    assert [r.id for r in app.reservaciones] == [1]
+
+
+def test_presupuesto_de_ordenamiento_invalido_falla_al_iniciar(tmp_path):
+    directorio = _hotel(str(tmp_path / "a"), [])
+    ruta = os.path.join(directorio, "config.json")
+    configs = leer_config(ruta)
+    configs["presupuesto_ordenamiento"] = 0
+
+    with pytest.raises(ValueError, match="entero positivo"):
+        App.desde_config(configs, directorio, ruta)
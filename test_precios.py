@@ -0,0 +1,62 @@
+import datetime
+
+import pytest
+
+from precios import ANIOS_TABLAS, MotorPrecios
+
+TARIFAS = {
+    "dias_semana": {"4": 1.1, "5": 1.1},
+    "temporadas": [
+        {"desde": "12-15", "hasta": "01-06", "factor": 1.25},
+        {"desde": "07-01", "hasta": "08-31", "precios": {"suite": 1100}},
+    ],
+}
+
+
+def _motor():
+    return MotorPrecios({"doble": 80, "suite": 950}, TARIFAS)
+
+
+def _noche_a_noche(motor, tipo, entrada, salida):
+    noches = (salida - entrada).days
+    return round(
+        sum(motor.tarifa(tipo, entrada + datetime.timedelta(days=n)) for n in range(noches)),
+        2,
+    )
+
+
+def test_cotizar_con_las_tablas():
+    motor = _motor()
+    hoy = datetime.date.today()
+    entrada = datetime.date(hoy.year, 12, 10)
+    salida = entrada + datetime.timedelta(days=40)
+
+    for tipo in ("doble", "suite"):
+        assert motor.cotizar(tipo, entrada, salida) == _noche_a_noche(motor, tipo, entrada, salida)
+    assert motor.cotizar("doble", salida, entrada) == 0.0
+
+
+@pytest.mark.parametrize(
+    "entrada",
+    [datetime.date(9999, 12, 28), datetime.date(202, 3, 1), datetime.date(1, 1, 1)],
+)
+def test_fechas_lejanas_no_amplian_las_tablas(entrada):
+    motor = _motor()
+    origen, fin = motor._origen, motor._fin
+    salida = entrada + datetime.timedelta(days=3)
+
+    assert not motor.en_limites(entrada, salida)
+    assert motor.cotizar("suite", entrada, salida) == _noche_a_noche(motor, "suite", entrada, salida)
+    assert (motor._origen, motor._fin) == (origen, fin)
+
+
+def test_las_tablas_se_amplian_hasta_el_limite():
+    motor = _motor()
+    hoy = datetime.date.today()
+    entrada = datetime.date(hoy.year + ANIOS_TABLAS, 12, 30)
+    salida = datetime.date(hoy.year + ANIOS_TABLAS + 1, 1, 1)
+
+    assert motor.en_limites(entrada, salida)
+    assert motor.cotizar("doble", entrada, salida) == _noche_a_noche(motor, "doble", entrada, salida)
+    assert motor._fin == salida
+    assert not motor.en_limites(entrada, salida + datetime.timedelta(days=1))